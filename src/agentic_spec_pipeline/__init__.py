@@ -7,7 +7,8 @@ def _load_env() -> None:
     except Exception:
         pass
 
-_load_env()
+if os.getenv("ASP_SKIP_DOTENV") != "1":
+    _load_env()
 
 __all__ = [
     "cli",
@@ -0,0 +1,15 @@
+"""
+Small I/O helpers shared by the generators, the CLI and the web API.
+"""
+
+from pathlib import Path
+
+try:
+    import orjson
+except ImportError:  # optional speedup; stdlib json is always available
+    orjson = None
+
+
+def write_utf8(path: Path, text: str) -> None:
+    """Write text as UTF-8 bytes, skipping the text-mode encoder and newline translation."""
+    path.write_bytes(text.encode("utf-8"))
@@ -1,19 +1,23 @@
+import functools
+import hashlib
 import json
 import os
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from importlib import resources
 from pathlib import Path
+from typing import List, Optional
 import socket
 from urllib.parse import urlparse
 import typer
 
-from .requirements.parser import parse_requirements_markdown
-from .requirements.sqlx_generator import generate_sqlx_from_requirements
-from .requirements.test_generator import generate_tests_from_requirements
-from .requirements.spec_writer import write_spec_artifacts
-
 app = typer.Typer(help="Specification-Driven Pipeline Agent CLI")
 
 DEFAULT_MODEL = os.getenv("ADK_DEFAULT_MODEL", "gemini-2.0-flash")
 
+# emulator-seed remembers applied DDL hashes here, one manifest per DDL directory,
+# so nothing is written into the user's source tree
+_SEED_STATE_DIR = Path("~/.cache/agentic_spec/emulator_seed").expanduser()
+
 
 def _normalize_emulator_endpoint(endpoint: str) -> str:
     if not endpoint:
@@ -27,18 +31,46 @@ def _normalize_emulator_endpoint(endpoint: str) -> str:
     return endpoint
 
 
-def _preflight_port(endpoint: str, timeout_s: float = 2.0) -> None:
+@functools.lru_cache(maxsize=16)
+def _probe(host: str, port: int, timeout_s: float) -> None:
+    # Only successful probes are cached; a failure raises and is retried next time
+    with socket.create_connection((host, port), timeout=timeout_s):
+        pass
+
+
+def _preflight_port(endpoint: str, timeout_s: float = 0.5) -> None:
+    if os.getenv("ASP_SKIP_PREFLIGHT") == "1":
+        return
     parsed = urlparse(endpoint)
     host = parsed.hostname or "127.0.0.1"
     port = parsed.port or 9050
-    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
-        s.settimeout(timeout_s)
+    try:
+        _probe(host, port, timeout_s)
+    except Exception as e:
+        raise typer.BadParameter(
+            f"Emulator not reachable at {host}:{port}. Ensure it's running and listening."
+        ) from e
+
+
+def _sql_files(directory: Path) -> List[Path]:
+    # Single directory read with a suffix check; no fnmatch or per-entry Path until matched
+    with os.scandir(directory) as it:
+        names = sorted(e.name for e in it if e.name.endswith(".sql") and e.is_file())
+    return [directory / name for name in names]
+
+
+def _cancel_jobs(jobs) -> None:
+    for job in jobs:
         try:
-            s.connect((host, port))
-        except Exception as e:
-            raise typer.BadParameter(
-                f"Emulator not reachable at {host}:{port}. Ensure it's running and listening."
-            ) from e
+            job.cancel()
+        except Exception:
+            pass
+
+
+@functools.lru_cache(maxsize=1)
+def _sample_requirements() -> str:
+    # Packaged with the wheel, so this works without a source checkout
+    return resources.files("agentic_spec_pipeline").joinpath("_templates/customer_order_pipeline_requirement.md").read_text()
 
 
 @app.command("init-req")
@@ -48,8 +80,7 @@ def init_requirements(
     """Write a sample requirements Markdown template."""
     out.parent.mkdir(parents=True, exist_ok=True)
     if not out.exists():
-        sample = (Path(__file__).parents[2] / "examples/business_requirements/customer_order_pipeline_requirement.md").read_text()
-        out.write_text(sample)
+        out.write_text(_sample_requirements())
         typer.echo(f"Wrote sample requirements to {out}")
     else:
         typer.echo(f"File already exists: {out}")
@@ -61,17 +92,21 @@ def spec_from_req(
     out_root: Path = typer.Option(Path("examples/technical_requirements"), "--out-root", help="Technical artifacts root (spec + mappings, not code)"),
     use_llm: bool = typer.Option(False, "--use-llm", help="Use LLM to preprocess requirements"),
     model: str = typer.Option(DEFAULT_MODEL, "--model", help="LLM model name (e.g., gemini-2.5-flash)"),
+    compact: bool = typer.Option(False, "--compact", help="Write spec.json without indentation"),
 ):
     """Create spec.json and mapping docs from a requirements Markdown file (no SQLX)."""
+    from .requirements.spec_writer import write_spec_artifacts
+
     md_text = req.read_text()
     if use_llm:
         from .requirements.llm_preprocessor import llm_preprocess_requirements
         data = llm_preprocess_requirements(md_text, model_name=model)
     else:
+        from .requirements.parser import parse_requirements_markdown
         data = parse_requirements_markdown(md_text)
 
     definitions_dir = out_root / "definitions"
-    artifacts = write_spec_artifacts(data, definitions_dir)
+    artifacts = write_spec_artifacts(data, definitions_dir, compact=compact)
     typer.echo(f"Spec JSON: {artifacts['spec_json']}")
     typer.echo(f"Mapping docs: {len(artifacts['mapping_docs'])} -> {out_root / 'mappings'}")
 
@@ -90,6 +125,7 @@ def sqlx_from_spec(
         written = generate_sqlx_with_llm(data, out_dir, model)
         typer.echo(f"Generated SQLX (LLM): {len(written)} -> {out_dir}")
     else:
+        from .requirements.sqlx_generator import generate_sqlx_from_requirements
         sqlx_path = generate_sqlx_from_requirements(data, out_dir)
         typer.echo(f"Generated SQLX (last written): {sqlx_path}")
 
@@ -109,6 +145,7 @@ def tests_from_spec(
         written = generate_tests_with_llm(data, out_dir, model)
         typer.echo(f"Generated tests (LLM): {len(written)} -> {out_dir}")
         return
+    from .requirements.test_generator import generate_tests_from_requirements
     source = req_source if req_source else spec
     written = generate_tests_from_requirements(data, out_dir, source=source)
     typer.echo(f"Generated tests: {len(written)} -> {out_dir}")
@@ -120,13 +157,13 @@ def emulator_seed(
     emulator_host: str = typer.Option(os.getenv("BIGQUERY_EMULATOR_HOST", "http://127.0.0.1:9050"), "--emulator-host", help="BigQuery emulator host (scheme+host:port)"),
     project: str = typer.Option("emulator-project", "--project", help="Project id for emulator namespaces"),
     timeout_sec: int = typer.Option(30, "--timeout-sec", help="Per-DDL timeout seconds"),
+    force: bool = typer.Option(False, "--force", help="Re-apply DDLs even if unchanged since the last seed"),
 ):
     """Apply DDLs to BigQuery emulator (goccy/bigquery-emulator)."""
     try:
         from google.cloud import bigquery
         from google.api_core.client_options import ClientOptions
         from google.auth.credentials import AnonymousCredentials
-        from google.api_core.exceptions import GoogleAPIError
     except Exception as e:
         raise typer.BadParameter("Install BigQuery extras: pip install -e '.[bigquery]'") from e
 
@@ -141,6 +178,7 @@ def emulator_seed(
     )
 
     # Ensure datasets exist
+    created = False
     for dataset in ("raw", "temp", "analytics"):
         ds_id = f"{project}.{dataset}"
         try:
@@ -148,22 +186,54 @@ def emulator_seed(
             typer.echo(f"Dataset exists: {ds_id}")
         except Exception:
             client.create_dataset(ds_id)
+            created = True
             typer.echo(f"Created dataset: {ds_id}")
 
-    ddls = sorted(ddl_dir.glob("*.sql"))
-    for ddl in ddls:
-        sql = ddl.read_text()
-        typer.echo(f"APPLY {ddl.name}...")
+    # Content hashes of DDLs already applied, per emulator endpoint/project
+    dir_key = hashlib.sha256(str(ddl_dir.resolve()).encode("utf-8")).hexdigest()[:16]
+    manifest_path = _SEED_STATE_DIR / f"{dir_key}.json"
+    manifest = {}
+    if manifest_path.exists():
         try:
-            job = client.query(sql)
-            job.result(timeout=timeout_sec)
-            typer.echo(f"APPLIED {ddl.name}")
-        except GoogleAPIError as ge:
-            typer.echo(f"ERROR {ddl.name}: {ge}")
-            raise
-        except Exception as e:
-            typer.echo(f"ERROR {ddl.name}: {e}")
-            raise
+            manifest = json.loads(manifest_path.read_text())
+        except ValueError:
+            manifest = {}
+    applied = manifest.setdefault(f"{endpoint}/{project}", {})
+    if created:
+        # A missing dataset means the emulator restarted empty; earlier hashes no longer hold
+        applied.clear()
+
+    # DDLs are independent once datasets exist: submit every job first, then await
+    # them, so the emulator round trips overlap instead of running back to back.
+    jobs = []
+    try:
+        for ddl in _sql_files(ddl_dir):
+            sql = ddl.read_text()
+            digest = hashlib.sha256(sql.encode("utf-8")).hexdigest()
+            if not force and applied.get(ddl.name) == digest:
+                typer.echo(f"UNCHANGED {ddl.name} (already applied; use --force if the emulator was restarted)")
+                continue
+            typer.echo(f"APPLY {ddl.name}...")
+            try:
+                jobs.append((ddl, digest, client.query(sql)))
+            except Exception as e:
+                typer.echo(f"ERROR {ddl.name}: {e}")
+                _cancel_jobs(job for _, _, job in jobs)
+                raise
+        for i, (ddl, digest, job) in enumerate(jobs):
+            try:
+                job.result(timeout=timeout_sec)
+                applied[ddl.name] = digest
+                typer.echo(f"APPLIED {ddl.name}")
+            except Exception as e:
+                # Covers GoogleAPIError as well as timeouts; stop whatever is still queued
+                typer.echo(f"ERROR {ddl.name}: {e}")
+                _cancel_jobs(pending for _, _, pending in jobs[i + 1 :])
+                raise
+    finally:
+        # Record whatever succeeded, even when a later DDL failed
+        manifest_path.parent.mkdir(parents=True, exist_ok=True)
+        manifest_path.write_text(json.dumps(manifest, indent=2))
     typer.echo("Emulator seeded with DDLs.")
 
 
@@ -198,28 +268,57 @@ def run_tests(
             raise typer.BadParameter("--project is required or set GOOGLE_CLOUD_PROJECT in env")
         client = bigquery.Client(project=project, location=location)
 
-    tests = sorted([p for p in dir.glob("*.sql")])
+    tests = _sql_files(dir)
     if not tests:
         typer.echo(f"No .sql tests found in {dir}")
         raise typer.Exit(0)
 
+    def _run(path: Path) -> None:
+        job = client.query(path.read_text(), job_config=bigquery.QueryJobConfig(use_legacy_sql=False))
+        job.result()
+
     results = []
-    for path in tests:
-        sql = path.read_text()
-        try:
-            job = client.query(sql, job_config=bigquery.QueryJobConfig(use_legacy_sql=False))
-            job.result()
-            results.append({"file": str(path), "status": "passed"})
-            typer.echo(f"PASS {path.name}")
-        except Exception as err:
-            results.append({"file": str(path), "status": "failed", "error": str(err)})
-            typer.echo(f"FAIL {path.name}: {err}")
-            if fail_fast:
-                break
+    passed = failed = 0
+    # Each result is also appended to results.jsonl as it lands, so progress survives
+    # an interrupted run and can be followed with `tail -f`.
+    with (dir / "results.jsonl").open("w") as log:
+
+        def _record(path: Path, err: Optional[BaseException]) -> bool:
+            """Log one finished test; returns True if it failed."""
+            nonlocal passed, failed
+            if err is None:
+                record = {"file": str(path), "status": "passed"}
+                passed += 1
+                typer.echo(f"PASS {path.name}")
+            else:
+                record = {"file": str(path), "status": "failed", "error": str(err)}
+                failed += 1
+                typer.echo(f"FAIL {path.name}: {err}")
+            results.append(record)
+            log.write(json.dumps(record) + "\n")
+            log.flush()
+            return err is not None
+
+        if fail_fast:
+            # One at a time, so the run stops at the first failure in file order with nothing in flight
+            for path in tests:
+                try:
+                    _run(path)
+                    err = None
+                except Exception as e:
+                    err = e
+                if _record(path, err):
+                    break
+        else:
+            # Test queries are independent and IO-bound on BigQuery RPCs; run a bounded number at once
+            workers = max(1, int(os.getenv("ASP_TEST_CONCURRENCY", "8")))
+            with ThreadPoolExecutor(max_workers=workers) as ex:
+                futures = {ex.submit(_run, p): p for p in tests}
+                for fut in as_completed(futures):
+                    _record(futures[fut], fut.exception())
+    results.sort(key=lambda r: r["file"])
 
     (dir / "results.json").write_text(json.dumps(results, indent=2))
-    passed = sum(1 for r in results if r["status"] == "passed")
-    failed = sum(1 for r in results if r["status"] == "failed")
     typer.echo(f"Completed. Passed: {passed}, Failed: {failed}. Results -> {dir / 'results.json'}")
 
 
@@ -1,20 +1,86 @@
 from __future__ import annotations
-from typing import Any, Dict, List
+from collections import deque
+from pathlib import Path
+from typing import Any, Callable, Deque, Dict, List, Tuple
+import functools
+import hashlib
 import importlib
 import pkgutil
 import inspect
+import json
 import os
+import re
+import threading
+import time
+
+from .._io import orjson
 
 SYSTEM_INSTRUCTION = (
     "You convert a data pipeline requirements Markdown (prose + tables) into a structured JSON spec. "
     "Output strictly JSON with keys: schema {raw_schema, staging_schema, final_schema}, "
     "models: [ {name, layer, sources, column_mapping, joins, filters, aggregations, group_by, constraints} ]. "
     "Do not include SQL code in the output, only expressions as needed in column_mapping.transform or aggregations.formula. "
-    "Respect table names as provided."
+    "Respect table names as provided. Return only valid JSON."
 )
 
+# Parsed specs are cached on disk keyed by (model, instruction, markdown) so reruns
+# over unchanged requirements skip the LLM round trip entirely. Raw generator
+# responses are cached the same way under responses/, keyed by the full prompt.
+# ASP_LLM_CACHE_TTL (seconds, 0 = never) expires on-disk entries.
+_CACHE_DIR = Path(os.getenv("ASP_LLM_CACHE", "~/.cache/agentic_spec")).expanduser()
+_CACHE_TTL = float(os.getenv("ASP_LLM_CACHE_TTL", "0"))
+_MEMORY_CACHE: Dict[str, str] = {}
+_RESPONSE_CACHE: Dict[str, str] = {}
+
+# Model instances reused across calls so the underlying client/channel is shared.
+# ADK models are keyed by model name; genai models also by system instruction.
+_ADK_MODELS: Dict[str, Any] = {}
+_GENAI_MODELS: Dict[Tuple[str, str], Any] = {}
+_GENAI_API_KEY: str | None = None
+
+
+def _cache_key(markdown_text: str, model_name: str) -> str:
+    payload = "\0".join((model_name, SYSTEM_INSTRUCTION, markdown_text))
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _read_cache_file(path: Path) -> str | None:
+    try:
+        if _CACHE_TTL > 0 and time.time() - path.stat().st_mtime >= _CACHE_TTL:
+            return None
+        return path.read_text()
+    except OSError:
+        return None
+
+
+def _write_cache_file(path: Path, text: str) -> None:
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(text)
+    except OSError:
+        pass
+
 
+def _cache_get(key: str) -> Dict[str, Any] | None:
+    text = _MEMORY_CACHE.get(key)
+    if text is None:
+        text = _read_cache_file(_CACHE_DIR / f"{key}.json")
+        if text is None:
+            return None
+        _MEMORY_CACHE[key] = text
+    # Decode on every hit so callers never share a mutable spec
+    return json.loads(text)
+
+
+def _cache_put(key: str, data: Dict[str, Any]) -> None:
+    text = json.dumps(data)
+    _MEMORY_CACHE[key] = text
+    _write_cache_file(_CACHE_DIR / f"{key}.json", text)
+
+
+@functools.lru_cache(maxsize=1)
 def _load_gemini():
+    # The class location is fixed per process; resolve it once.
     # First try common explicit paths
     candidates = [
         ("google.adk.models.google", "Gemini"),
@@ -35,6 +101,10 @@ def _load_gemini():
         except Exception:
             continue
 
+    # Walking the ADK package trees imports dozens of modules; only do it on request
+    if os.getenv("ASP_ADK_DEEP_SCAN") != "1":
+        return None
+
     # Walk packages to discover Gemini class dynamically
     pkg_names = ["google.adk", "adk"]
     for pkg_name in pkg_names:
@@ -62,17 +132,21 @@ def _load_gemini():
     return None
 
 
-def _call_llm_with_adk(markdown_text: str, model_name: str) -> str:
+def _compose_prompt(system_instruction: str, content: str) -> str:
+    # Static instructions lead so repeated calls share a provider-cacheable prefix;
+    # only the per-call content varies at the tail.
+    return system_instruction + "\n\n" + content
+
+
+def _call_llm_with_adk(content: str, model_name: str, system_instruction: str) -> str:
     Gemini = _load_gemini()
     if Gemini is None:
         raise ModuleNotFoundError("Gemini class not found in ADK")
-    model = Gemini(name=model_name)
-    prompt = (
-        SYSTEM_INSTRUCTION
-        + "\n\nRequirements Markdown:\n\n"
-        + markdown_text
-        + "\n\nReturn only valid JSON."
-    )
+    model = _ADK_MODELS.get(model_name)
+    if model is None:
+        model = Gemini(name=model_name)
+        _ADK_MODELS[model_name] = model
+    prompt = _compose_prompt(system_instruction, content)
     # Try known method names
     for meth in ("generate", "generate_content", "generate_text", "invoke", "run"):
         if hasattr(model, meth):
@@ -84,7 +158,12 @@ def _call_llm_with_adk(markdown_text: str, model_name: str) -> str:
     raise AttributeError("ADK Gemini model has no known generation method")
 
 
-def _call_llm_with_genai(markdown_text: str, model_name: str) -> str:
+def _call_llm_with_genai(
+    content: str,
+    model_name: str,
+    system_instruction: str,
+    response_schema: Dict[str, Any] | None = None,
+) -> str:
     try:
         import google.generativeai as genai
         from google.api_core.exceptions import NotFound
@@ -104,22 +183,28 @@ def _call_llm_with_genai(markdown_text: str, model_name: str) -> str:
     if not api_key:
         raise EnvironmentError("GOOGLE_API_KEY is not set for google-generativeai usage")
 
-    genai.configure(api_key=api_key)
+    # configure() resets the SDK's shared client; only redo it when the key changes
+    global _GENAI_API_KEY
+    if _GENAI_API_KEY != api_key:
+        genai.configure(api_key=api_key)
+        _GENAI_API_KEY = api_key
+        _GENAI_MODELS.clear()
 
-    prompt = (
-        SYSTEM_INSTRUCTION
-        + "\n\nRequirements Markdown:\n\n"
-        + markdown_text
-        + "\n\nReturn only valid JSON."
-    )
+    # Every caller parses JSON; let the model emit it natively instead of prose + fences
+    generation_config: Dict[str, Any] = {"response_mime_type": "application/json"}
+    if response_schema is not None:
+        generation_config["response_schema"] = response_schema
 
     # Try requested model first, then fall back to known supported IDs
     candidates: List[str] = [model_name, "gemini-2.0-flash", "gemini-1.5-pro-latest", "gemini-1.5-flash-latest"]
     last_err: Exception | None = None
     for m in candidates:
         try:
-            model = genai.GenerativeModel(m)
-            resp = model.generate_content(prompt)
+            model = _GENAI_MODELS.get((m, system_instruction))
+            if model is None:
+                model = genai.GenerativeModel(m, system_instruction=system_instruction)
+                _GENAI_MODELS[(m, system_instruction)] = model
+            resp = model.generate_content(content, generation_config=generation_config)
             return resp.text or ""
         except NotFound as e:
             last_err = e
@@ -132,30 +217,151 @@ def _call_llm_with_genai(markdown_text: str, model_name: str) -> str:
     raise RuntimeError("LLM call failed with no exception info")
 
 
+_loads = orjson.loads if orjson is not None else json.loads
+_DECODER = json.JSONDecoder()
+
+
+def _dumps(obj: Any) -> str:
+    # Minimized JSON for prompts; orjson emits no whitespace by default
+    if orjson is not None:
+        return orjson.dumps(obj).decode("utf-8")
+    return json.dumps(obj, separators=(",", ":"))
+
+
+def _first_json_object(text: str) -> Dict[str, Any]:
+    # Decode the first complete object starting at a "{", skipping braces in prose
+    i = text.find("{")
+    while i != -1:
+        try:
+            obj, _ = _DECODER.raw_decode(text, i)
+            return obj
+        except json.JSONDecodeError:
+            i = text.find("{", i + 1)
+    raise ValueError("LLM did not return valid JSON spec")
+
+
+_FENCE_RE = re.compile(r"```(?:json)?\s*(.*?)\s*```", re.S)
+
+
+def _extract_json(text: str) -> Dict[str, Any]:
+    m = _FENCE_RE.search(text)
+    body = (m.group(1) if m else text).strip()
+    # Pure JSON is the common case; otherwise decode the first object in the prose
+    try:
+        obj = _loads(body)
+    except ValueError:
+        obj = None
+    if isinstance(obj, dict):
+        return obj
+    return _first_json_object(body)
+
+
+# Generator prompts are limited to ASP_LLM_QPM requests and ASP_LLM_TPM prompt tokens
+# (estimated at 4 chars/token) in any 60s window (0 = no limit). _throttle is passed as
+# before_call, so cache hits don't count; _with_retry retries a failed call with
+# exponential backoff before surfacing the failure.
+_RETRIES = 3
+_QPM = int(os.getenv("ASP_LLM_QPM", "0"))
+_TPM = int(os.getenv("ASP_LLM_TPM", "0"))
+_recent_calls: Deque[Tuple[float, int]] = deque()
+_recent_tokens = 0
+_recent_lock = threading.Lock()
+
+
+def _throttle(tokens: int = 0) -> None:
+    global _recent_tokens
+    if _QPM <= 0 and _TPM <= 0:
+        return
+    while True:
+        with _recent_lock:
+            now = time.monotonic()
+            while _recent_calls and now - _recent_calls[0][0] >= 60:
+                _recent_tokens -= _recent_calls.popleft()[1]
+            under_qpm = _QPM <= 0 or len(_recent_calls) < _QPM
+            # A single oversized prompt still goes out once the window is empty
+            under_tpm = _TPM <= 0 or not _recent_calls or _recent_tokens + tokens <= _TPM
+            if under_qpm and under_tpm:
+                _recent_calls.append((now, tokens))
+                _recent_tokens += tokens
+                return
+            wait = 60 - (now - _recent_calls[0][0])
+        time.sleep(wait)
+
+
+def _with_retry(call: Callable[..., str], *args: Any) -> str:
+    delay = 1.0
+    for _ in range(_RETRIES - 1):
+        try:
+            return call(*args)
+        except Exception:
+            time.sleep(delay)
+            delay *= 2
+    return call(*args)
+
+
+def _call_llm_cached(
+    content: str,
+    model_name: str,
+    system_instruction: str,
+    response_schema: Dict[str, Any] | None = None,
+    before_call: Callable[[], None] | None = None,
+) -> str:
+    """
+    Call ADK (falling back to google-generativeai), reusing a cached response for an identical prompt.
+    before_call (e.g. a rate limiter) runs only on a cache miss, right before the provider is called.
+    """
+    parts = [model_name, system_instruction, content]
+    if response_schema is not None:
+        parts.append(json.dumps(response_schema, sort_keys=True))
+    key = hashlib.sha256("\0".join(parts).encode("utf-8")).hexdigest()
+
+    text = _RESPONSE_CACHE.get(key)
+    if text is not None:
+        return text
+    path = _CACHE_DIR / "responses" / f"{key}.txt"
+    text = _read_cache_file(path)
+    if text is None:
+        if before_call is not None:
+            before_call()
+        try:
+            text = _call_llm_with_adk(content, model_name, system_instruction)
+        except Exception:
+            text = _call_llm_with_genai(content, model_name, system_instruction, response_schema)
+        # Only keep responses the generators can parse (they all read replies with
+        # _extract_json), so a bad answer is retried next run instead of replayed
+        try:
+            _extract_json(text)
+        except ValueError:
+            return text
+        _write_cache_file(path, text)
+    _RESPONSE_CACHE[key] = text
+    return text
+
+
 def llm_preprocess_requirements(markdown_text: str, model_name: str = "gemini-2.0-flash") -> Dict[str, Any]:
+    key = _cache_key(markdown_text, model_name)
+    cached = _cache_get(key)
+    if cached is not None:
+        return cached
+
+    content = "Requirements Markdown:\n\n" + markdown_text
     # Try ADK first; fallback to google-generativeai
     try:
-        text = _call_llm_with_adk(markdown_text, model_name)
+        text = _call_llm_with_adk(content, model_name, SYSTEM_INSTRUCTION)
     except Exception:
-        text = _call_llm_with_genai(markdown_text, model_name)
+        text = _call_llm_with_genai(content, model_name, SYSTEM_INSTRUCTION)
 
     # Simple JSON extraction: assume the model returns pure JSON per instruction
-    import json
-
     text = (text or "").strip()
     try:
-        data = json.loads(text)
-    except Exception:
-        start = text.find("{")
-        end = text.rfind("}")
-        if start != -1 and end != -1 and end > start:
-            data = json.loads(text[start : end + 1])
-        else:
-            raise ValueError("LLM did not return valid JSON spec")
+        data = _loads(text)
+    except ValueError:
+        data = _first_json_object(text)
 
     data.setdefault("schema", {})
     data["schema"].setdefault("raw_schema", "raw")
     data["schema"].setdefault("staging_schema", "temp")
     data["schema"].setdefault("final_schema", "analytics")
     data.setdefault("models", [])
+    _cache_put(key, data)
     return data
@@ -1,10 +1,10 @@
 from __future__ import annotations
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Any, Dict, List
-import json
-import re
 
-from .llm_preprocessor import _call_llm_with_adk, _call_llm_with_genai
+from .._io import write_utf8
+from .llm_preprocessor import _call_llm_cached, _dumps, _extract_json, _loads, _throttle, _with_retry
 
 SYSTEM = (
     "You are a senior data engineer generating BigQuery SQLX (Dataform) code. "
@@ -33,54 +33,29 @@ PER_MODEL_INSTRUCTIONS = (
     "- Output JSON: {\"sqlx_text\": string | {\"config\": string, \"sql\": string}}. Return ONLY JSON."
 )
 
+# Constrains the per-model response to {"sqlx_text": "..."} when the genai client is used
+PER_MODEL_RESPONSE_SCHEMA = {
+    "type": "object",
+    "properties": {"sqlx_text": {"type": "string"}},
+    "required": ["sqlx_text"],
+}
+
 
 def _call_llm_general(spec: Dict[str, Any], model_name: str) -> str:
-    spec_min = json.dumps(spec, separators=(",", ":"))
-    prompt = (
-        SYSTEM
-        + "\n\nSpec JSON (minimized):\n"
-        + spec_min
-        + "\n\n"
-        + INSTRUCTIONS
-    )
-    try:
-        return _call_llm_with_adk(prompt, model_name)
-    except Exception:
-        return _call_llm_with_genai(prompt, model_name)
-
-
-def _call_llm_per_model(spec: Dict[str, Any], model: Dict[str, Any], model_name: str) -> str:
-    payload = {"schema": spec.get("schema", {}), "model": model}
-    payload_min = json.dumps(payload, separators=(",", ":"))
-    prompt = (
-        SYSTEM
-        + "\n\nSpec/Model JSON (minimized):\n"
-        + payload_min
-        + "\n\n"
-        + PER_MODEL_INSTRUCTIONS
+    spec_min = _dumps(spec)
+    system = SYSTEM + "\n\n" + INSTRUCTIONS
+    content = "Spec JSON (minimized):\n" + spec_min
+    return _call_llm_cached(content, model_name, system, before_call=lambda: _throttle(len(content) // 4))
+
+
+def _call_llm_per_model(schema_min: str, model: Dict[str, Any], model_name: str) -> str:
+    # schema_min is serialized once by the caller and shared across every model
+    payload_min = f'{{"schema":{schema_min},"model":{_dumps(model)}}}'
+    system = SYSTEM + "\n\n" + PER_MODEL_INSTRUCTIONS
+    content = "Spec/Model JSON (minimized):\n" + payload_min
+    return _call_llm_cached(
+        content, model_name, system, PER_MODEL_RESPONSE_SCHEMA, before_call=lambda: _throttle(len(content) // 4)
     )
-    try:
-        return _call_llm_with_adk(prompt, model_name)
-    except Exception:
-        return _call_llm_with_genai(prompt, model_name)
-
-
-_JSON_RE = re.compile(r"\{[\s\S]*\}")
-
-
-def _extract_json(text: str) -> Dict[str, Any]:
-    s = text.strip()
-    if s.startswith("```"):
-        parts = s.split("```", 2)
-        if len(parts) == 3:
-            body = parts[1]
-            if body.startswith("json"):
-                body = body[4:]
-            s = body
-    m = _JSON_RE.search(s)
-    if not m:
-        raise ValueError("LLM did not return JSON")
-    return json.loads(m.group(0))
 
 
 def _schema_for_layer(spec_schema: Dict[str, Any], layer: str) -> str:
@@ -91,28 +66,26 @@ def _schema_for_layer(spec_schema: Dict[str, Any], layer: str) -> str:
 
 def _normalize_sqlx_value(value: Any, spec: Dict[str, Any], model: Dict[str, Any]) -> str:
     if isinstance(value, str):
+        if not value.lstrip().startswith("{"):
+            return value
         v = value.strip()
-        if v.startswith("{") and v.endswith("}"):
-            try:
-                obj = json.loads(v)
-                return _normalize_sqlx_value(obj, spec, model)
-            except Exception:
-                return value
-        return value
+        if not v.endswith("}"):
+            return value
+        # A JSON-encoded object: decode once and fall through to the dict shape
+        try:
+            value = _loads(v)
+        except ValueError:
+            return value
     if isinstance(value, dict):
         config_text = value.get("config")
         sql_text = value.get("sql")
-        if isinstance(config_text, dict):
-            layer_schema = _schema_for_layer(spec.get("schema", {}), model.get("layer", "final"))
-            config_line = f"config {{ type: \"table\", schema: \"{layer_schema}\" }}"
-        elif isinstance(config_text, str) and config_text.strip():
-            config_line = config_text.strip()
-        else:
+        config_line = config_text.strip() if isinstance(config_text, str) else ""
+        if not config_line:
+            # Missing, empty or structured config: derive the header from the model layer
             layer_schema = _schema_for_layer(spec.get("schema", {}), model.get("layer", "final"))
             config_line = f"config {{ type: \"table\", schema: \"{layer_schema}\" }}"
         sql_body = sql_text if isinstance(sql_text, str) else ""
-        composed = f"{config_line}\n{sql_body}\n"
-        return composed
+        return f"{config_line}\n{sql_body}\n"
     return str(value)
 
 
@@ -133,16 +106,22 @@ def generate_sqlx_with_llm(spec: Dict[str, Any], out_dir: Path, model_name: str)
                     path = out_dir / f"{name}.sqlx"
                     if not sqlx_text.endswith("\n"):
                         sqlx_text = sqlx_text + "\n"
-                    path.write_text(sqlx_text)
+                    write_utf8(path, sqlx_text)
                     written.append(str(path))
                 if written:
                     return written
     except Exception:
         pass
 
-    # Fallback: per-model generation
-    for model in spec.get("models", []):
-        resp = _call_llm_per_model(spec, model, model_name)
+    # Fallback: per-model generation. The LLM calls are independent and network-bound,
+    # so fan them out; parsing and writing stay sequential in spec order.
+    models = spec.get("models", [])
+    if not models:
+        return written
+    schema_min = _dumps(spec.get("schema", {}))
+    with ThreadPoolExecutor(max_workers=min(8, len(models))) as ex:
+        responses = list(ex.map(lambda m: _with_retry(_call_llm_per_model, schema_min, m, model_name), models))
+    for model, resp in zip(models, responses):
         obj = _extract_json(resp)
         name = model.get("name", "model")
         raw_val = obj.get("sqlx_text", obj)
@@ -150,6 +129,6 @@ def generate_sqlx_with_llm(spec: Dict[str, Any], out_dir: Path, model_name: str)
         path = out_dir / f"{name}.sqlx"
         if not sqlx_text.endswith("\n"):
             sqlx_text = sqlx_text + "\n"
-        path.write_text(sqlx_text)
+        write_utf8(path, sqlx_text)
         written.append(str(path))
     return written
@@ -1,10 +1,11 @@
 from __future__ import annotations
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Any, Dict, List
 import json
-import re
 
-from .llm_preprocessor import _call_llm_with_adk, _call_llm_with_genai
+from .._io import write_utf8
+from .llm_preprocessor import _call_llm_cached, _dumps, _extract_json, _throttle, _with_retry
 
 SYSTEM = (
     "You are a senior data engineer generating rigorous BigQuery SQL test scripts. "
@@ -29,42 +30,42 @@ PER_MODEL_INSTRUCTIONS = (
     "- Output JSON: {\"test_sql\": string | {\"sql\": string, \"assertions\": [string]}}. Return ONLY JSON."
 )
 
+BATCH_INSTRUCTIONS = (
+    "Instructions:\n"
+    "- Generate one BigQuery SQL test for EACH model in this batch.\n"
+    "- Include temp tables/CTEs for fixtures and assertions.\n"
+    "- Focus on invariants relevant to each model's logic.\n"
+    "- Output JSON mapping model_name -> test_sql (string | {\"sql\": string, \"assertions\": [string]}). Return ONLY JSON."
+)
+
 
 def _call_llm_general(spec: Dict[str, Any], model_name: str) -> str:
-    spec_min = json.dumps(spec, separators=(",", ":"))
-    prompt = SYSTEM + "\n\nSpec JSON (minimized):\n" + spec_min + "\n\n" + INSTRUCTIONS
-    try:
-        return _call_llm_with_adk(prompt, model_name)
-    except Exception:
-        return _call_llm_with_genai(prompt, model_name)
+    spec_min = _dumps(spec)
+    system = SYSTEM + "\n\n" + INSTRUCTIONS
+    content = "Spec JSON (minimized):\n" + spec_min
+    return _call_llm_cached(content, model_name, system, before_call=lambda: _throttle(len(content) // 4))
 
 
 def _call_llm_per_model(spec: Dict[str, Any], model: Dict[str, Any], model_name: str) -> str:
     payload = {"schema": spec.get("schema", {}), "model": model}
-    payload_min = json.dumps(payload, separators=(",", ":"))
-    prompt = SYSTEM + "\n\nSpec/Model JSON (minimized):\n" + payload_min + "\n\n" + PER_MODEL_INSTRUCTIONS
-    try:
-        return _call_llm_with_adk(prompt, model_name)
-    except Exception:
-        return _call_llm_with_genai(prompt, model_name)
+    payload_min = _dumps(payload)
+    system = SYSTEM + "\n\n" + PER_MODEL_INSTRUCTIONS
+    content = "Spec/Model JSON (minimized):\n" + payload_min
+    return _call_llm_cached(content, model_name, system, before_call=lambda: _throttle(len(content) // 4))
 
 
-_JSON_RE = re.compile(r"\{[\s\S]*\}")
+def _call_llm_batch(spec: Dict[str, Any], models_chunk: List[Dict[str, Any]], model_name: str) -> str:
+    payload = {"schema": spec.get("schema", {}), "models": models_chunk}
+    payload_min = _dumps(payload)
+    system = SYSTEM + "\n\n" + BATCH_INSTRUCTIONS
+    content = "Spec/Models JSON (minimized):\n" + payload_min
+    return _call_llm_cached(content, model_name, system, before_call=lambda: _throttle(len(content) // 4))
 
 
-def _extract_json(text: str) -> Dict[str, Any]:
-    s = text.strip()
-    if s.startswith("```"):
-        parts = s.split("```", 2)
-        if len(parts) == 3:
-            body = parts[1]
-            if body.startswith("json"):
-                body = body[4:]
-            s = body
-    m = _JSON_RE.search(s)
-    if not m:
-        raise ValueError("LLM did not return JSON")
-    return json.loads(m.group(0))
+# Fallback fan-out: models go out _BATCH_SIZE per prompt, at most _MAX_WORKERS prompts at
+# a time; the rate limits and retries come from llm_preprocessor
+_MAX_WORKERS = 8
+_BATCH_SIZE = 5
 
 
 def _normalize_test_value(value: Any) -> str:
@@ -98,23 +99,55 @@ def generate_tests_with_llm(spec: Dict[str, Any], out_dir: Path, model_name: str
                     path = out_dir / f"test_{name}.sql"
                     if not test_sql.endswith("\n"):
                         test_sql = test_sql + "\n"
-                    path.write_text(test_sql)
+                    write_utf8(path, test_sql)
                     written.append(str(path))
                 if written:
                     return written
     except Exception:
         pass
 
-    # Per-model fallback
-    for model in spec.get("models", []):
-        resp = _call_llm_per_model(spec, model, model_name)
-        obj = _extract_json(resp)
-        raw_val = obj.get("test_sql", obj)
-        test_sql = _normalize_test_value(raw_val)
+    # Batched fallback: send the models _BATCH_SIZE per prompt, fanned out; any model a
+    # batch answer leaves out gets its own prompt. Files are written in spec order.
+    models = spec.get("models", [])
+    if not models:
+        return written
+    chunks = [models[i : i + _BATCH_SIZE] for i in range(0, len(models), _BATCH_SIZE)]
+    results: Dict[int, Any] = {}
+    missing: List[int] = []
+
+    def _batch(chunk: List[Dict[str, Any]]) -> str | None:
+        # A batch that still fails after its retries only sends its own models to
+        # single-model prompts; the other batches' answers are kept
+        try:
+            return _with_retry(_call_llm_batch, spec, chunk, model_name)
+        except Exception:
+            return None
+
+    with ThreadPoolExecutor(max_workers=min(_MAX_WORKERS, len(chunks))) as ex:
+        batch_resps = list(ex.map(_batch, chunks))
+    for n, (chunk, resp) in enumerate(zip(chunks, batch_resps)):
+        try:
+            mapping = _extract_json(resp) if resp is not None else {}
+        except ValueError:
+            mapping = {}
+        for k, model in enumerate(chunk, n * _BATCH_SIZE):
+            val = mapping.get(model.get("name", "model"))
+            if isinstance(val, (str, dict)):
+                results[k] = val
+            else:
+                missing.append(k)
+    if missing:
+        with ThreadPoolExecutor(max_workers=min(_MAX_WORKERS, len(missing))) as ex:
+            resps = list(ex.map(lambda k: _with_retry(_call_llm_per_model, spec, models[k], model_name), missing))
+        for k, resp in zip(missing, resps):
+            obj = _extract_json(resp)
+            results[k] = obj.get("test_sql", obj)
+    for k, model in enumerate(models):
+        test_sql = _normalize_test_value(results[k])
         name = model.get("name", "model")
         path = out_dir / f"test_{name}.sql"
         if not test_sql.endswith("\n"):
             test_sql = test_sql + "\n"
-        path.write_text(test_sql)
+        write_utf8(path, test_sql)
         written.append(str(path))
     return written
@@ -3,6 +3,11 @@ from typing import Any, Dict
 import yaml
 from .table_parser import parse_models_from_markdown
 
+try:
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:  # PyYAML built without libyaml
+    from yaml import SafeLoader as _YamlLoader
+
 FENCED_YAML = re.compile(r"```yaml\s*([\s\S]*?)\s*```", re.IGNORECASE)
 # Only match frontmatter at the very start of the document
 FRONTMATTER_START = re.compile(r"\A---\s*\n([\s\S]*?)\n---\s*", re.MULTILINE)
@@ -16,7 +21,7 @@ def parse_requirements_markdown(markdown_text: str) -> Dict[str, Any]:
         match = FRONTMATTER_START.match(markdown_text)
     if match:
         yaml_text = match.group(1)
-        data = yaml.safe_load(yaml_text) or {}
+        data = yaml.load(yaml_text, Loader=_YamlLoader) or {}
 
     # Defaults
     data.setdefault("schema", {})
@@ -1,34 +1,44 @@
 from __future__ import annotations
+from concurrent.futures import ThreadPoolExecutor
+from io import StringIO
 from pathlib import Path
 from typing import Any, Dict, List
 import json
 
+from .._io import orjson, write_utf8
 
-def _md_table(headers: List[str], rows: List[List[Any]]) -> str:
-    header_row = "| " + " | ".join(headers) + " |"
-    sep_row = "|" + "|".join(["-" * (len(h) + 2) for h in headers]) + "|"
-    data_rows = []
-    for r in rows:
-        cells = [("" if (c is None) else str(c)) for c in r]
-        data_rows.append("| " + " | ".join(cells) + " |")
-    return "\n".join([header_row, sep_row, *data_rows])
 
+def _md_table(headers: List[str], rows: List[List[Any]], buf: StringIO) -> None:
+    """Write a markdown table into buf; every row, including the last, ends with a newline."""
+    buf.write("| ")
+    buf.write(" | ".join(headers))
+    buf.write(" |\n|")
+    buf.write("|".join(["-" * (len(h) + 2) for h in headers]))
+    buf.write("|\n")
+    join = " | ".join
+    # Mapping tables are almost always all strings; then cells need no conversion at all
+    if all(type(c) is str for r in rows for c in r):
+        buf.writelines("| " + join(r) + " |\n" for r in rows)
+    else:
+        _s = str
+        buf.writelines("| " + join(["" if c is None else _s(c) for c in r]) + " |\n" for r in rows)
 
-def _write_model_doc(model: Dict[str, Any], out_dir: Path) -> Path:
+
+def _render_model_doc(model: Dict[str, Any]) -> str:
     name = model.get("name", "model")
-    out_dir.mkdir(parents=True, exist_ok=True)
-    lines: List[str] = []
+    # Sections are separated by a blank line; each one writes its own leading newline
+    buf = StringIO()
 
     layer = model.get("layer", "staging")
     sources = ", ".join(model.get("sources", []))
-    lines.append(f"# Model: {name} (layer: {layer})\n")
+    buf.write(f"# Model: {name} (layer: {layer})\n")
     if sources:
-        lines.append(f"Sources: {sources}\n")
+        buf.write(f"\nSources: {sources}\n")
 
     # Column mapping
     cols = model.get("column_mapping", [])
     if cols:
-        lines.append("## Column mapping\n")
+        buf.write("\n## Column mapping\n\n")
         headers = [
             "target_column",
             "type",
@@ -54,12 +64,12 @@ def _write_model_doc(model: Dict[str, Any], out_dir: Path) -> Path:
                 tests_val,
                 c.get("description", ""),
             ])
-        lines.append(_md_table(headers, rows) + "\n")
+        _md_table(headers, rows, buf)
 
     # Joins
     joins = model.get("joins", [])
     if joins:
-        lines.append("## Joins\n")
+        buf.write("\n## Joins\n\n")
         headers = ["left_table", "right_table", "type", "condition"]
         rows = [
             [
@@ -70,12 +80,12 @@ def _write_model_doc(model: Dict[str, Any], out_dir: Path) -> Path:
             ]
             for j in joins
         ]
-        lines.append(_md_table(headers, rows) + "\n")
+        _md_table(headers, rows, buf)
 
     # Filters
     filters = model.get("filters", [])
     if filters:
-        lines.append("## Filters\n")
+        buf.write("\n## Filters\n\n")
         headers = ["applies_to", "predicate", "rationale"]
         rows = [
             [
@@ -85,12 +95,12 @@ def _write_model_doc(model: Dict[str, Any], out_dir: Path) -> Path:
             ]
             for f in filters
         ]
-        lines.append(_md_table(headers, rows) + "\n")
+        _md_table(headers, rows, buf)
 
     # Aggregations
     aggs = model.get("aggregations", [])
     if aggs:
-        lines.append("## Aggregations\n")
+        buf.write("\n## Aggregations\n\n")
         headers = ["metric_column", "type", "formula", "tests", "description"]
         rows = []
         for a in aggs:
@@ -104,48 +114,62 @@ def _write_model_doc(model: Dict[str, Any], out_dir: Path) -> Path:
                 tests_val,
                 a.get("description", ""),
             ])
-        lines.append(_md_table(headers, rows) + "\n")
+        _md_table(headers, rows, buf)
 
     # Group by
     group_by = model.get("group_by", [])
     if group_by:
-        lines.append("## Group by\n")
+        buf.write("\n## Group by\n\n")
         headers = ["group_key"]
         rows = [[k] for k in group_by]
-        lines.append(_md_table(headers, rows) + "\n")
+        _md_table(headers, rows, buf)
 
     # Constraints
     constraints = model.get("constraints", {})
     if constraints:
-        lines.append("## Output constraints\n")
+        buf.write("\n## Output constraints\n\n")
         headers = list(constraints.keys())
         rows = [list(constraints.values())]
-        lines.append(_md_table(headers, rows) + "\n")
+        _md_table(headers, rows, buf)
 
-    out_path = out_dir / f"{name}.md"
-    out_path.write_text("\n".join(lines))
-    return out_path
+    return buf.getvalue()
 
 
-def write_spec_artifacts(spec: Dict[str, Any], definitions_dir: Path) -> Dict[str, Any]:
+def write_spec_artifacts(spec: Dict[str, Any], definitions_dir: Path, compact: bool = False) -> Dict[str, Any]:
     """
     Write a machine-readable spec.json and per-model mapping docs next to the generated project.
-    - spec.json at <project_root>/spec.json
+    - spec.json at <project_root>/spec.json (compact=True drops indentation for machine consumers)
     - mappings/<model>.md per model
     Returns a summary with written paths.
     """
     project_root = definitions_dir.parent
     project_root.mkdir(parents=True, exist_ok=True)
 
-    # Write JSON spec
+    # Write JSON spec; orjson encodes straight to bytes, else stream through stdlib json
     spec_path = project_root / "spec.json"
-    spec_path.write_text(json.dumps(spec, indent=2))
+    if orjson is not None:
+        spec_path.write_bytes(orjson.dumps(spec, option=0 if compact else orjson.OPT_INDENT_2))
+    else:
+        with spec_path.open("w", encoding="utf-8") as fp:
+            if compact:
+                json.dump(spec, fp, separators=(",", ":"))
+            else:
+                json.dump(spec, fp, indent=2)
 
     # Write per-model mapping docs
     mappings_dir = project_root / "mappings"
+    models = spec.get("models", [])
     written_md: List[str] = []
-    for model in spec.get("models", []):
-        p = _write_model_doc(model, mappings_dir)
-        written_md.append(str(p))
+    if models:
+        mappings_dir.mkdir(parents=True, exist_ok=True)
+        # Render in order on this thread, then fan out only the file writes.
+        # Keyed by path so a repeated model name still ends with the last doc, as before.
+        docs: Dict[Path, str] = {}
+        for model in models:
+            p = mappings_dir / f"{model.get('name', 'model')}.md"
+            docs[p] = _render_model_doc(model)
+            written_md.append(str(p))
+        with ThreadPoolExecutor(max_workers=min(32, len(docs))) as ex:
+            list(ex.map(lambda item: write_utf8(*item), docs.items()))
 
     return {"spec_json": str(spec_path), "mapping_docs": written_md}
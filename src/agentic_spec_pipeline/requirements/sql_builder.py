@@ -1,13 +1,25 @@
 from __future__ import annotations
 from typing import List
+import functools
 from .table_parser import ModelSpec
 
 
 def _select_expr(col: dict) -> str:
-    src = col.get("from_table", "").strip()
-    src_col = col.get("from_column", "").strip()
-    transform = (col.get("transform") or "").strip()
-    target = col.get("target_column", "").strip()
+    # Keyed on just the fields that shape the expression, so extra (unhashable) keys like tests lists are fine
+    return _select_expr_cached(
+        col.get("from_table", ""),
+        col.get("from_column", ""),
+        col.get("transform") or "",
+        col.get("target_column", ""),
+    )
+
+
+@functools.lru_cache(maxsize=4096)
+def _select_expr_cached(src: str, src_col: str, transform: str, target: str) -> str:
+    src = src.strip()
+    src_col = src_col.strip()
+    transform = transform.strip()
+    target = target.strip()
 
     base = f"{src}.{src_col}" if src and src_col else "NULL"
     if "{from}" in transform:
@@ -19,6 +31,11 @@ def _select_expr(col: dict) -> str:
     return f"{expr} AS {target}"
 
 
+@functools.lru_cache(maxsize=1024)
+def _join_sql(jt: str, right: str, cond: str) -> str:
+    return f"{jt} JOIN ${{ref('{right}')}} ON {cond}"
+
+
 def _build_staging_sql(model: ModelSpec) -> str:
     # Build FROM + JOINS
     sources = [s for s in model.sources]
@@ -32,7 +49,7 @@ def _build_staging_sql(model: ModelSpec) -> str:
         right = j.get("right_table", "").strip()
         cond = j.get("condition", "").strip()
         if right and cond:
-            join_sqls.append(f"{jt} JOIN ${{ref('{right}')}} ON {cond}")
+            join_sqls.append(_join_sql(jt, right, cond))
 
     where_sqls: List[str] = []
     for f in model.filters:
@@ -43,14 +60,15 @@ def _build_staging_sql(model: ModelSpec) -> str:
 
     select_list = ",\n       ".join(_select_expr(c) for c in model.column_mapping if c.get("target_column"))
 
-    sql = [
-        f"SELECT\n       {select_list}\nFROM ${{ref('{from_table}')}}"
-    ]
-    if join_sqls:
-        sql.append("\n".join(join_sqls))
+    # Fragments are concatenated once; separators live in the fragments themselves
+    parts = ["SELECT\n       ", select_list, "\nFROM ${ref('", from_table, "')}"]
+    for j_sql in join_sqls:
+        parts.append("\n")
+        parts.append(j_sql)
     if where_sqls:
-        sql.append("\nWHERE " + " AND ".join(where_sqls))
-    return "\n".join(sql)
+        parts.append("\n\nWHERE ")
+        parts.append(" AND ".join(where_sqls))
+    return "".join(parts)
 
 
 def _build_final_sql(model: ModelSpec) -> str:
@@ -62,13 +80,11 @@ def _build_final_sql(model: ModelSpec) -> str:
             if col and formula:
                 select_list.append(f"{formula} AS {col}")
         group_by = model.group_by or []
-        group_sql = "\nGROUP BY " + ", ".join(group_by) if group_by else ""
-        return (
-            "SELECT\n       "
-            + ",\n       ".join(select_list)
-            + "\nFROM ${{ref('stg_orders')}}"
-            + group_sql
-        )
+        parts = ["SELECT\n       ", ",\n       ".join(select_list), "\nFROM ${{ref('stg_orders')}}"]
+        if group_by:
+            parts.append("\nGROUP BY ")
+            parts.append(", ".join(group_by))
+        return "".join(parts)
     # If no aggregations, treat like staging pass-through
     return _build_staging_sql(model)
 
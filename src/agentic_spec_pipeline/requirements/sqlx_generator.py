@@ -1,6 +1,9 @@
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Any, Dict, List
+from .._io import write_utf8
 from .sql_builder import build_sqlx_from_model
+from .table_parser import ModelSpec
 
 
 def _to_ref(name: str) -> str:
@@ -18,8 +21,6 @@ def _emit_config(schema: str) -> str:
 def _generate_model_sqlx(model: Dict[str, Any], schema_map: Dict[str, str]) -> str:
     # If table-driven fields are present, delegate to builder
     if model.get("column_mapping") or model.get("aggregations"):
-        from .table_parser import ModelSpec
-
         spec = ModelSpec(
             name=model["name"],
             layer=model.get("layer", "staging"),
@@ -36,21 +37,17 @@ def _generate_model_sqlx(model: Dict[str, Any], schema_map: Dict[str, str]) -> s
     layer = model.get("layer", "staging")
     schema = schema_map["staging_schema"] if layer == "staging" else schema_map["final_schema"]
 
-    parts: List[str] = []
-    parts.append(_emit_config(schema))
+    parts: List[str] = [_emit_config(schema), "\n"]
 
     ctes = model.get("ctes", [])
     if ctes:
-        cte_sqls: List[str] = []
-        for c in ctes:
-            cte_sqls.append(f"{c['name']} AS (\n{c['select'].strip()}\n)\n")
-        with_block = "WITH\n" + ",\n\n".join(cte_sqls) + "\n"
-        parts.append(with_block)
-
-    final_select = model.get("final_select", "SELECT 1 AS placeholder")
-    parts.append(final_select + "\n")
+        parts.append("WITH\n")
+        parts.append(",\n\n".join(f"{c['name']} AS (\n{c['select'].strip()}\n)\n" for c in ctes))
+        parts.append("\n\n")
 
-    return "\n".join(parts)
+    parts.append(model.get("final_select", "SELECT 1 AS placeholder"))
+    parts.append("\n")
+    return "".join(parts)
 
 
 def generate_sqlx_from_requirements(req: Dict[str, Any], out_dir: Path) -> Path:
@@ -60,12 +57,16 @@ def generate_sqlx_from_requirements(req: Dict[str, Any], out_dir: Path) -> Path:
     out_dir.mkdir(parents=True, exist_ok=True)
 
     last_path: Path | None = None
+    # Generate in order on this thread, then fan out only the file writes
+    outputs: Dict[Path, str] = {}
     for model in models:
         name = model["name"]
-        sqlx_text = _generate_model_sqlx(model, schema_map)
         path = out_dir / f"{name}.sqlx"
-        path.write_text(sqlx_text)
+        outputs[path] = _generate_model_sqlx(model, schema_map)
         last_path = path
+    if outputs:
+        with ThreadPoolExecutor(max_workers=min(32, len(outputs))) as ex:
+            list(ex.map(lambda item: write_utf8(*item), outputs.items()))
 
     # Backward compatibility for single transform spec (if present)
     if not models and req.get("transforms"):
@@ -82,7 +83,7 @@ def generate_sqlx_from_requirements(req: Dict[str, Any], out_dir: Path) -> Path:
         parts.append(final_select + "\n")
         text = "\n".join(parts)
         path = out_dir / f"{final_name}.sqlx"
-        path.write_text(text)
+        write_utf8(path, text)
         last_path = path
 
     return last_path or (out_dir / "_no_models.sqlx")
@@ -1,27 +1,39 @@
 from __future__ import annotations
 from dataclasses import dataclass, field
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 import re
 
 TABLE_BLOCK_RE = re.compile(r"```markdown\s*([\s\S]*?)\s*```", re.IGNORECASE)
 HEADER_SEP_RE = re.compile(r"^\|\s*-", re.MULTILINE)
+SECTION_TITLES = ("Column mapping", "Joins", "Filters", "Aggregations", "Group by", "Output constraints")
+_SECTION_KEYS = tuple((title, title.lower()) for title in SECTION_TITLES)
+# One tokenizer for everything the model scan needs: a model header, a Sources value, or a
+# ```markdown fence together with the title line just above it. Alternatives are tried in
+# order at each position, so fence bodies are consumed whole and never re-scanned; a fence
+# left open never runs past the next model header.
+_TOKEN_RE = re.compile(
+    r"^###\s+Model:\s*(?P<model>[^\s]+)\s*\(schema:\s*(?P<schema>[^\)]+)\)\s*$"
+    r"|Sources:\s*`(?P<sources>[^`]+)`"
+    r"|(?:^(?P<title>[^\n]*)\n)?^(?i:```markdown)\n(?P<table>(?:(?!```|###\s+Model:)[^\n]*\n)*)```",
+    re.MULTILINE,
+)
 
 
 def _parse_markdown_table(md_text: str) -> List[Dict[str, str]]:
-    lines = [ln.strip() for ln in md_text.strip().splitlines() if ln.strip()]
-    if len(lines) < 2:
-        return []
-    headers = [h.strip() for h in lines[0].strip('|').split('|')]
+    it = (ln.strip() for ln in md_text.splitlines())
+    it = (ln for ln in it if ln)
+    first = next(it, None)
     # second line should be separator; skip it
-    data_rows = lines[2:]
+    if first is None or next(it, None) is None:
+        return []
+    headers = tuple(h.strip() for h in first.strip('|').split('|'))
+    width = len(headers)
     rows: List[Dict[str, str]] = []
-    for row in data_rows:
-        cols = [c.strip() for c in row.strip('|').split('|')]
-        # pad/truncate to headers length
-        if len(cols) < len(headers):
-            cols += [""] * (len(headers) - len(cols))
-        elif len(cols) > len(headers):
-            cols = cols[: len(headers)]
+    for row in it:
+        # maxsplit bounds the work on over-wide rows; zip drops any extra cell
+        cols = tuple(c.strip() for c in row.strip('|').split('|', width))
+        if len(cols) < width:
+            cols += ("",) * (width - len(cols))
         rows.append(dict(zip(headers, cols)))
     return rows
 
@@ -39,26 +51,47 @@ class ModelSpec:
     constraints: Dict[str, str] = field(default_factory=dict)
 
 
+def _scan_model_blocks(doc_text: str) -> List[Tuple[str, str, Optional[str], Dict[str, str]]]:
+    """
+    Tokenize the document in one pass and collect per model its name, schema, raw
+    Sources value and the body of each titled ```markdown fence. A section is the
+    first fence whose preceding line ends with one of SECTION_TITLES (case-insensitive).
+    """
+    blocks: List[Tuple[str, str, Optional[str], Dict[str, str]]] = []
+    sources: Optional[str] = None
+    sections: Dict[str, str] = {}
+    current: Optional[Tuple[str, str]] = None
+    for tok in _TOKEN_RE.finditer(doc_text):
+        kind = tok.lastgroup
+        if kind == "schema":
+            if current:
+                blocks.append((*current, sources, sections))
+            current = (tok.group("model").strip(), tok.group("schema").strip())
+            sources, sections = None, {}
+        elif current is None:
+            continue
+        elif kind == "sources":
+            if sources is None:
+                sources = tok.group("sources")
+        else:
+            title_line = (tok.group("title") or "").lower()
+            for title, key in _SECTION_KEYS:
+                if title not in sections and title_line.endswith(key):
+                    sections[title] = tok.group("table")
+    if current:
+        blocks.append((*current, sources, sections))
+    return blocks
+
+
 def parse_models_from_markdown(doc_text: str) -> List[ModelSpec]:
     models: List[ModelSpec] = []
 
     # Find model headers like: "### Model: stg_customers (schema: temp)"
-    model_iter = re.finditer(r"(?m)^###\s+Model:\s*([^\s]+)\s*\(schema:\s*([^\)]+)\)\s*$", doc_text)
-    model_spans = [(m.start(), m.end(), m.group(1).strip(), m.group(2).strip()) for m in model_iter]
-
-    # Append end sentinel
-    model_spans.append((len(doc_text), len(doc_text), "__end__", ""))
-
-    for i in range(len(model_spans) - 1):
-        start, _, model_name, schema_name = model_spans[i]
-        next_start, _, _, _ = model_spans[i + 1]
-        block = doc_text[start:next_start]
-
+    for model_name, schema_name, sources_text, sections in _scan_model_blocks(doc_text):
         # Sources line
-        m_src = re.search(r"Sources:\s*`([^`]+)`", block)
         sources = []
-        if m_src:
-            srcs = [s.strip() for s in m_src.group(1).split(',')]
+        if sources_text:
+            srcs = [s.strip() for s in sources_text.split(',')]
             sources = [s.split('.')[-1] for s in srcs]  # table names only
 
         # Determine layer from schema name
@@ -66,10 +99,10 @@ def parse_models_from_markdown(doc_text: str) -> List[ModelSpec]:
 
         # Extract fenced tables by section titles
         def section_table(title: str) -> List[Dict[str, str]]:
-            m = re.search(rf"{re.escape(title)}\n```markdown\n([\s\S]*?)\n```", block, re.IGNORECASE)
-            if not m:
+            body = sections.get(title)
+            if body is None:
                 return []
-            return _parse_markdown_table(m.group(1))
+            return _parse_markdown_table(body)
 
         column_mapping = section_table("Column mapping")
         joins = section_table("Joins")
@@ -96,4 +129,4 @@ def parse_models_from_markdown(doc_text: str) -> List[ModelSpec]:
             )
         )
 
-    return [m for m in models if m.name != "__end__"]
+    return models
@@ -1,6 +1,7 @@
 from pathlib import Path
 from typing import Any, Dict, List
 
+from .._io import write_utf8
 from ..tools.test_generator import _write_mock_temp_table_sql
 
 TEST_HEADER = """-- Auto-generated tests from requirements
@@ -23,26 +24,20 @@ def generate_tests_from_requirements(req: Dict[str, Any], out_dir: Path, source:
 
     written: List[str] = []
 
+    # Mock SQL depends only on the sources, so every test file shares one rendering
+    sql_text = "\n".join([TEST_HEADER.format(source=source), *_emit_mocks(req), "SELECT 1 AS test_assertion;\n"])
+
     models = req.get("models", [])
     if models:
         for model in models:
-            parts: List[str] = [TEST_HEADER.format(source=source)]
-            parts.extend(_emit_mocks(req))
-            parts.append("SELECT 1 AS test_assertion;\n")
-            sql_text = "\n".join(parts)
             out_path = out_dir / f"test_req_{model['name']}.sql"
-            out_path.write_text(sql_text)
+            write_utf8(out_path, sql_text)
             written.append(str(out_path))
         return written
 
     # Fallback single test
-    parts: List[str] = [TEST_HEADER.format(source=source)]
-    parts.extend(_emit_mocks(req))
-    parts.append("SELECT 1 AS test_assertion;\n")
-    sql_text = "\n".join(parts)
-
     final_name = req.get("final", {}).get("name", "final_output")
     out_path = out_dir / f"test_req_{final_name}.sql"
-    out_path.write_text(sql_text)
+    write_utf8(out_path, sql_text)
     written.append(str(out_path))
     return written
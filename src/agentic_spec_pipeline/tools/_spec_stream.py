@@ -0,0 +1,32 @@
+"""
+Shared spec.json reading support for the spec_to_* tools and the web API.
+
+Both decoders come from the [speedups] extra: orjson for whole-file loads, ijson to read very
+large specs model by model.
+"""
+
+from pathlib import Path
+
+try:
+    import orjson
+except ImportError:  # optional speedup; stdlib json is always available
+    orjson = None
+
+try:
+    import ijson
+except ImportError:  # optional; only needed to stream very large specs
+    ijson = None
+
+# Specs larger than this are read incrementally with ijson instead of loaded whole
+STREAM_THRESHOLD_BYTES = 50_000_000
+
+
+class _StreamedModels:
+    """Re-iterable view of spec['models']; every pass re-reads the file one model at a time."""
+
+    def __init__(self, path: Path):
+        self.path = path
+
+    def __iter__(self):
+        with open(self.path, 'rb') as f:
+            yield from ijson.items(f, 'models.item')
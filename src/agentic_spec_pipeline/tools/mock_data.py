@@ -1,7 +1,5 @@
 from typing import Dict, List
-from faker import Faker
-
-fake = Faker()
+import random
 
 
 def generate_mock_fixtures(ref_tables: List[str], num_rows: int = 5) -> Dict[str, str]:
@@ -11,9 +9,9 @@ def generate_mock_fixtures(ref_tables: List[str], num_rows: int = 5) -> Dict[str
     Returns a mapping: table_name -> CSV string.
     """
     fixtures: Dict[str, str] = {}
+    values = range(1001)
     for table in ref_tables:
-        rows = ["id,value"]
-        for i in range(num_rows):
-            rows.append(f"{i+1},{fake.random_int(min=0, max=1000)}")
-        fixtures[table] = "\n".join(rows) + "\n"
+        # Draw the whole column in one call, then format once
+        vals = random.choices(values, k=num_rows)
+        fixtures[table] = "id,value\n" + "".join(f"{i},{v}\n" for i, v in enumerate(vals, 1))
     return fixtures
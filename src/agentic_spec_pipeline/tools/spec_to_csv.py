@@ -12,10 +12,34 @@ Example:
 
 import json
 import csv
+import io
+import re
 import sys
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack
 from pathlib import Path
 from typing import Any, Dict, List
 
+try:
+    from ._spec_stream import STREAM_THRESHOLD_BYTES, _StreamedModels, ijson, orjson
+except ImportError:  # run as a script from the tools directory
+    from _spec_stream import STREAM_THRESHOLD_BYTES, _StreamedModels, ijson, orjson
+
+# Anything but letters, digits, '_' and '-' is replaced in model CSV file names
+_UNSAFE_FNAME = re.compile(r'[^\w-]')
+
+
+def _constraint_cell(value: Any) -> str:
+    """Render a constraint value; dicts and lists as compact JSON, everything else via str()."""
+    if not value:
+        return ''
+    if isinstance(value, (dict, list)):
+        # default=str covers the Decimals ijson yields when streaming
+        if orjson:
+            return orjson.dumps(value, default=str).decode('utf-8')
+        return json.dumps(value, ensure_ascii=False, separators=(',', ':'), default=str)
+    return str(value)
+
 
 class SpecToCSVConverter:
     """Converts spec.json to multiple CSV files for business review."""
@@ -23,322 +47,362 @@ class SpecToCSVConverter:
     def __init__(self, spec_path: str):
         """Initialize converter with spec file path."""
         self.spec_path = Path(spec_path)
-        with open(self.spec_path, 'r') as f:
-            self.spec = json.load(f)
+        self.streaming = ijson is not None and self.spec_path.stat().st_size > STREAM_THRESHOLD_BYTES
+        if self.streaming:
+            self.models = _StreamedModels(self.spec_path)
+            self.spec = {'models': self.models}
+            self.model_cache = None
+            return
+        with open(self.spec_path, 'rb') as f:
+            self.spec = orjson.loads(f.read()) if orjson else json.load(f)
+        self.models = self.spec.get('models', []) or []
+        # Per-model fields shared by several CSVs, computed once; 'raw' is the spec dict itself
+        self.model_cache = [self._model_entry(m) for m in self.models]
+
+    @staticmethod
+    def _model_entry(m: Dict[str, Any]) -> Dict[str, Any]:
+        cols = m.get('column_mapping') or []
+        aggs = m.get('aggregations') or []
+        joins = m.get('joins') or []
+        constraints = m.get('constraints') or {}
+        return {
+            'name': m.get('name', ''),
+            'layer': m.get('layer', ''),
+            'joined_sources': ', '.join(m.get('sources', [])),
+            'has_joins': bool(joins),
+            'has_aggs': bool(aggs),
+            'pk': constraints.get('primary_key', ''),
+            'cols': cols,
+            'aggs': aggs,
+            'joins': joins,
+            'constraints': constraints,
+            'raw': m,
+        }
+
+    # Consolidated views: (file name, header row, row emitter), all filled in one model walk
+    _VIEWS = (
+        ("00_overview.csv",
+         ["Model Name", "Layer", "Source Tables", "Total Columns",
+          "Has Joins", "Has Aggregations", "Primary Key"],
+         '_emit_overview_rows'),
+        ("01_all_columns.csv",
+         ["Model", "Layer", "Column Name", "Type", "Source Table",
+          "Source Column", "Transform", "Nullable", "Tests", "Description"],
+         '_emit_column_rows'),
+        ("02_all_transforms.csv",
+         ["Model", "Column", "Type", "Transform Logic", "Description"],
+         '_emit_transform_rows'),
+        ("03_all_joins.csv",
+         ["Model", "Layer", "Left Table", "Right Table",
+          "Join Type", "Join Condition"],
+         '_emit_join_rows'),
+        ("04_all_tests.csv",
+         ["Model", "Layer", "Column", "Test Type", "Description"],
+         '_emit_test_rows'),
+        ("05_data_lineage.csv",
+         ["Model", "Layer", "Depends On (Sources)", "Used By (Downstream)"],
+         '_emit_lineage_rows'),
+    )
 
     def convert(self, output_dir: str) -> None:
         """Main conversion method - creates all CSV files."""
         out_path = Path(output_dir)
         out_path.mkdir(parents=True, exist_ok=True)
 
-        self._create_overview_csv(out_path)
-        self._create_all_columns_csv(out_path)
-        self._create_all_transforms_csv(out_path)
-        self._create_all_joins_csv(out_path)
-        self._create_all_tests_csv(out_path)
-        self._create_data_lineage_csv(out_path)
-
-        # Create individual model CSVs
-        for model in self.spec.get('models', []):
-            self._create_model_csv(model, out_path)
-
-        print(f"\n✓ CSV files created in: {output_dir}")
-
-    def _create_overview_csv(self, out_path: Path) -> None:
-        """Create models overview CSV."""
-        filepath = out_path / "00_overview.csv"
-
-        with open(filepath, 'w', newline='', encoding='utf-8') as f:
-            writer = csv.writer(f)
-
-            # Header
-            writer.writerow(["Model Name", "Layer", "Source Tables", "Total Columns",
-                           "Has Joins", "Has Aggregations", "Primary Key"])
-
-            # Data rows
-            for model in self.spec.get('models', []):
-                total_cols = len(model.get('column_mapping', [])) + len(model.get('aggregations', []) or [])
-                writer.writerow([
-                    model.get('name', ''),
-                    model.get('layer', ''),
-                    ', '.join(model.get('sources', [])),
-                    total_cols,
-                    'Yes' if model.get('joins') else 'No',
-                    'Yes' if model.get('aggregations') else 'No',
-                    model.get('constraints', {}).get('primary_key', '')
+        if self.streaming:
+            # One model in memory at a time: its model CSV is written during the shared walk
+            written = self._create_consolidated_csvs(out_path, per_model=True)
+        else:
+            # Every file is independent, so the consolidated views and the individual
+            # model CSVs are written concurrently; names are reported in a fixed order
+            with ThreadPoolExecutor(max_workers=8) as ex:
+                consolidated = ex.submit(self._create_consolidated_csvs, out_path)
+                per_model = [ex.submit(self._create_model_csv, entry, out_path) for entry in self.model_cache]
+                written = consolidated.result() + [fut.result() for fut in per_model]
+
+        # One write for the whole report rather than a print per file
+        report = [f"  ✓ {filepath.name}" for filepath in written]
+        report.append(f"\n✓ CSV files created in: {output_dir}")
+        sys.stdout.write("\n".join(report) + "\n")
+
+    def _create_consolidated_csvs(self, out_path: Path, per_model: bool = False) -> List[Path]:
+        """Create the overview/columns/transforms/joins/tests/lineage CSVs in a single pass over the models.
+
+        With per_model=True each model's own CSV is written during the same pass and its path is
+        appended after the consolidated ones.
+        """
+        self._downstream_map = self._build_downstream_map()
+
+        with ExitStack() as stack:
+            # Rows for each view are collected across all models and handed to csv.writerows in
+            # one call, so the per-cell work stays inside the C writer. When streaming, each
+            # model's rows are flushed straight to the open files instead.
+            views = []
+            for filename, header, emitter in self._VIEWS:
+                filepath = out_path / filename
+                if self.streaming:
+                    buf = stack.enter_context(open(filepath, 'w', newline='', encoding='utf-8'))
+                else:
+                    buf = io.StringIO(newline='')
+                writer = csv.writer(buf)
+                writer.writerow(header)
+                views.append((filepath, buf, writer, getattr(self, emitter), []))
+
+            entries = self.model_cache if self.model_cache is not None else map(self._model_entry, self.models)
+            model_paths = []
+            for entry in entries:
+                for _, _, writer, emit, rows in views:
+                    emit(rows, entry)
+                    if self.streaming:
+                        writer.writerows(rows)
+                        rows.clear()
+                if per_model:
+                    model_paths.append(self._create_model_csv(entry, out_path))
+
+        if not self.streaming:
+            for filepath, buf, writer, _, rows in views:
+                writer.writerows(rows)
+                filepath.write_bytes(buf.getvalue().encode('utf-8'))
+        return [view[0] for view in views] + model_paths
+
+    def _emit_overview_rows(self, rows: List[list], entry: Dict[str, Any]) -> None:
+        """Models overview row."""
+        total_cols = len(entry['cols']) + len(entry['aggs'])
+        rows.append([
+            entry['name'],
+            entry['layer'],
+            entry['joined_sources'],
+            total_cols,
+            'Yes' if entry['has_joins'] else 'No',
+            'Yes' if entry['has_aggs'] else 'No',
+            entry['pk']
+        ])
+
+    def _emit_column_rows(self, rows: List[list], entry: Dict[str, Any]) -> None:
+        """Consolidated column rows."""
+        model_name = entry['name']
+        layer = entry['layer']
+        add = rows.append
+
+        # Column mappings
+        for col_map in entry['cols']:
+            g = col_map.get
+            add([
+                model_name,
+                layer,
+                g('target_column', ''),
+                g('type', ''),
+                g('from_table', ''),
+                g('from_column', ''),
+                g('transform', '') or 'None',
+                'Yes' if g('nullable') else 'No',
+                ', '.join(g('tests', [])),
+                g('description', '') or ''
+            ])
+
+        # Aggregations
+        for agg in entry['aggs']:
+            g = agg.get
+            add([
+                model_name,
+                layer,
+                g('metric_column', ''),
+                g('type', ''),
+                'AGGREGATION',
+                '',
+                g('formula', ''),
+                '',
+                ', '.join(g('tests', [])),
+                g('description', '') or ''
+            ])
+
+    def _emit_transform_rows(self, rows: List[list], entry: Dict[str, Any]) -> None:
+        """Transformation rows - only columns with transforms."""
+        model_name = entry['name']
+        add = rows.append
+
+        for col_map in entry['cols']:
+            g = col_map.get
+            transform = g('transform')
+            if transform:
+                add([
+                    model_name,
+                    g('target_column', ''),
+                    'Column Transform',
+                    transform,
+                    g('description', '') or ''
                 ])
 
-        print(f"  ✓ {filepath.name}")
-
-    def _create_all_columns_csv(self, out_path: Path) -> None:
-        """Create consolidated columns CSV."""
-        filepath = out_path / "01_all_columns.csv"
-
-        with open(filepath, 'w', newline='', encoding='utf-8') as f:
-            writer = csv.writer(f)
-
-            # Header
-            writer.writerow(["Model", "Layer", "Column Name", "Type", "Source Table",
-                           "Source Column", "Transform", "Nullable", "Tests", "Description"])
-
-            # Data rows
-            for model in self.spec.get('models', []):
-                model_name = model.get('name', '')
-                layer = model.get('layer', '')
-
-                # Column mappings
-                for col_map in model.get('column_mapping', []):
-                    writer.writerow([
-                        model_name,
-                        layer,
-                        col_map.get('target_column', ''),
-                        col_map.get('type', ''),
-                        col_map.get('from_table', ''),
-                        col_map.get('from_column', ''),
-                        col_map.get('transform', '') or 'None',
-                        'Yes' if col_map.get('nullable') else 'No',
-                        ', '.join(col_map.get('tests', [])),
-                        col_map.get('description', '') or ''
-                    ])
-
-                # Aggregations
-                for agg in model.get('aggregations', []) or []:
-                    writer.writerow([
-                        model_name,
-                        layer,
-                        agg.get('metric_column', ''),
-                        agg.get('type', ''),
-                        'AGGREGATION',
-                        '',
-                        agg.get('formula', ''),
-                        '',
-                        ', '.join(agg.get('tests', [])),
-                        agg.get('description', '') or ''
-                    ])
-
-        print(f"  ✓ {filepath.name}")
-
-    def _create_all_transforms_csv(self, out_path: Path) -> None:
-        """Create CSV focusing on transformations."""
-        filepath = out_path / "02_all_transforms.csv"
-
-        with open(filepath, 'w', newline='', encoding='utf-8') as f:
-            writer = csv.writer(f)
-
-            # Header
-            writer.writerow(["Model", "Column", "Type", "Transform Logic", "Description"])
-
-            # Data rows - only columns with transforms
-            for model in self.spec.get('models', []):
-                model_name = model.get('name', '')
-
-                for col_map in model.get('column_mapping', []):
-                    transform = col_map.get('transform')
-                    if transform:
-                        writer.writerow([
-                            model_name,
-                            col_map.get('target_column', ''),
-                            'Column Transform',
-                            transform,
-                            col_map.get('description', '') or ''
-                        ])
-
-                for agg in model.get('aggregations', []) or []:
-                    writer.writerow([
-                        model_name,
-                        agg.get('metric_column', ''),
-                        'Aggregation',
-                        agg.get('formula', ''),
-                        agg.get('description', '') or ''
-                    ])
-
-        print(f"  ✓ {filepath.name}")
-
-    def _create_all_joins_csv(self, out_path: Path) -> None:
-        """Create CSV with all join definitions."""
-        filepath = out_path / "03_all_joins.csv"
-
-        with open(filepath, 'w', newline='', encoding='utf-8') as f:
-            writer = csv.writer(f)
-
-            # Header
-            writer.writerow(["Model", "Layer", "Left Table", "Right Table",
-                           "Join Type", "Join Condition"])
-
-            # Data rows
-            for model in self.spec.get('models', []):
-                model_name = model.get('name', '')
-                layer = model.get('layer', '')
-
-                for join in model.get('joins', []):
-                    writer.writerow([
-                        model_name,
-                        layer,
-                        join.get('left_table', ''),
-                        join.get('right_table', ''),
-                        join.get('type', ''),
-                        join.get('condition', '')
-                    ])
-
-        print(f"  ✓ {filepath.name}")
-
-    def _create_all_tests_csv(self, out_path: Path) -> None:
-        """Create CSV with all data quality tests."""
-        filepath = out_path / "04_all_tests.csv"
-
-        with open(filepath, 'w', newline='', encoding='utf-8') as f:
-            writer = csv.writer(f)
-
-            # Header
-            writer.writerow(["Model", "Layer", "Column", "Test Type", "Description"])
-
-            # Data rows
-            for model in self.spec.get('models', []):
-                model_name = model.get('name', '')
-                layer = model.get('layer', '')
-
-                # Column tests
-                for col_map in model.get('column_mapping', []):
-                    col_name = col_map.get('target_column', '')
-                    for test in col_map.get('tests', []):
-                        writer.writerow([
-                            model_name,
-                            layer,
-                            col_name,
-                            test,
-                            col_map.get('description', '') or ''
-                        ])
-
-                # Aggregation tests
-                for agg in model.get('aggregations', []) or []:
-                    col_name = agg.get('metric_column', '')
-                    for test in agg.get('tests', []):
-                        writer.writerow([
-                            model_name,
-                            layer,
-                            col_name,
-                            test,
-                            agg.get('description', '') or ''
-                        ])
-
-        print(f"  ✓ {filepath.name}")
-
-    def _create_data_lineage_csv(self, out_path: Path) -> None:
-        """Create data lineage CSV."""
-        filepath = out_path / "05_data_lineage.csv"
-
-        # Build dependency map
-        model_names = {m['name'] for m in self.spec.get('models', [])}
+        for agg in entry['aggs']:
+            g = agg.get
+            add([
+                model_name,
+                g('metric_column', ''),
+                'Aggregation',
+                g('formula', ''),
+                g('description', '') or ''
+            ])
+
+    def _emit_join_rows(self, rows: List[list], entry: Dict[str, Any]) -> None:
+        """Join definition rows."""
+        model_name = entry['name']
+        layer = entry['layer']
+        add = rows.append
+
+        for join in entry['joins']:
+            g = join.get
+            add([
+                model_name,
+                layer,
+                g('left_table', ''),
+                g('right_table', ''),
+                g('type', ''),
+                g('condition', '')
+            ])
+
+    def _emit_test_rows(self, rows: List[list], entry: Dict[str, Any]) -> None:
+        """Data quality test rows."""
+        model_name = entry['name']
+        layer = entry['layer']
+        add = rows.append
+
+        # Column tests
+        for col_map in entry['cols']:
+            g = col_map.get
+            col_name = g('target_column', '')
+            description = g('description', '') or ''
+            for test in g('tests', []):
+                add([model_name, layer, col_name, test, description])
+
+        # Aggregation tests
+        for agg in entry['aggs']:
+            g = agg.get
+            col_name = g('metric_column', '')
+            description = g('description', '') or ''
+            for test in g('tests', []):
+                add([model_name, layer, col_name, test, description])
+
+    def _build_downstream_map(self) -> Dict[str, List[str]]:
+        """Map each model name to the models that read from it."""
+        model_names = {m['name'] for m in self.models}
         downstream_map = {name: [] for name in model_names}
 
-        for model in self.spec.get('models', []):
+        for model in self.models:
             for source in model.get('sources', []):
-                for potential_upstream in model_names:
-                    if potential_upstream in source:
-                        downstream_map[potential_upstream].append(model['name'])
-
-        with open(filepath, 'w', newline='', encoding='utf-8') as f:
-            writer = csv.writer(f)
-
-            # Header
-            writer.writerow(["Model", "Layer", "Depends On (Sources)", "Used By (Downstream)"])
-
-            # Data rows
-            for model in self.spec.get('models', []):
-                model_name = model.get('name', '')
-                writer.writerow([
-                    model_name,
-                    model.get('layer', ''),
-                    ', '.join(model.get('sources', [])),
-                    ', '.join(sorted(set(downstream_map.get(model_name, []))))
-                ])
-
-        print(f"  ✓ {filepath.name}")
-
-    def _create_model_csv(self, model: Dict[str, Any], out_path: Path) -> None:
+                # A source names a model either outright or as a dotted part (e.g. temp.stg_orders)
+                for upstream in model_names.intersection((source, *source.split('.'))):
+                    downstream_map[upstream].append(model['name'])
+        return downstream_map
+
+    def _emit_lineage_rows(self, rows: List[list], entry: Dict[str, Any]) -> None:
+        """Data lineage row."""
+        model_name = entry['name']
+        rows.append([
+            model_name,
+            entry['layer'],
+            entry['joined_sources'],
+            ', '.join(sorted(set(self._downstream_map.get(model_name, []))))
+        ])
+
+    def _create_model_csv(self, entry: Dict[str, Any], out_path: Path) -> Path:
         """Create detailed CSV for individual model."""
+        model = entry['raw']
         model_name = model.get('name', 'unknown')
         # Sanitize filename
-        safe_name = "".join(c if c.isalnum() or c in ('_', '-') else '_' for c in model_name)
+        safe_name = _UNSAFE_FNAME.sub('_', model_name)
         filepath = out_path / f"model_{safe_name}.csv"
 
-        with open(filepath, 'w', newline='', encoding='utf-8') as f:
+        with io.StringIO(newline='') as f:
             writer = csv.writer(f)
 
             # Model metadata
             writer.writerow(["MODEL", model_name])
-            writer.writerow(["Layer", model.get('layer', '')])
-            writer.writerow(["Sources", ', '.join(model.get('sources', []))])
-            writer.writerow([])
+            writer.writerow(["Layer", entry['layer']])
+            writer.writerow(["Sources", entry['joined_sources']])
+            f.write('\r\n')
 
             # Column mappings
-            if model.get('column_mapping'):
+            if entry['cols']:
                 writer.writerow(["COLUMN MAPPINGS"])
                 writer.writerow(["Target Column", "Type", "From Table", "From Column",
                                "Transform", "Nullable", "Tests", "Description"])
 
-                for col_map in model['column_mapping']:
-                    writer.writerow([
-                        col_map.get('target_column', ''),
-                        col_map.get('type', ''),
-                        col_map.get('from_table', ''),
-                        col_map.get('from_column', ''),
-                        col_map.get('transform', '') or '',
-                        'Yes' if col_map.get('nullable') else 'No',
-                        ', '.join(col_map.get('tests', [])),
-                        col_map.get('description', '') or ''
+                rows = []
+                for col_map in entry['cols']:
+                    g = col_map.get
+                    rows.append([
+                        g('target_column', ''),
+                        g('type', ''),
+                        g('from_table', ''),
+                        g('from_column', ''),
+                        g('transform', '') or '',
+                        'Yes' if g('nullable') else 'No',
+                        ', '.join(g('tests', [])),
+                        g('description', '') or ''
                     ])
-                writer.writerow([])
+                writer.writerows(rows)
+                f.write('\r\n')
 
             # Aggregations
-            if model.get('aggregations'):
+            if entry['aggs']:
                 writer.writerow(["AGGREGATIONS"])
                 writer.writerow(["Metric Column", "Type", "Formula", "Tests", "Description"])
 
-                for agg in model['aggregations']:
-                    writer.writerow([
-                        agg.get('metric_column', ''),
-                        agg.get('type', ''),
-                        agg.get('formula', ''),
-                        ', '.join(agg.get('tests', [])),
-                        agg.get('description', '') or ''
+                rows = []
+                for agg in entry['aggs']:
+                    g = agg.get
+                    rows.append([
+                        g('metric_column', ''),
+                        g('type', ''),
+                        g('formula', ''),
+                        ', '.join(g('tests', [])),
+                        g('description', '') or ''
                     ])
-                writer.writerow([])
+                writer.writerows(rows)
+                f.write('\r\n')
 
             # Joins
-            if model.get('joins'):
+            if entry['joins']:
                 writer.writerow(["JOINS"])
                 writer.writerow(["Left Table", "Right Table", "Type", "Condition"])
 
-                for join in model['joins']:
-                    writer.writerow([
-                        join.get('left_table', ''),
-                        join.get('right_table', ''),
-                        join.get('type', ''),
-                        join.get('condition', '')
+                rows = []
+                for join in entry['joins']:
+                    g = join.get
+                    rows.append([
+                        g('left_table', ''),
+                        g('right_table', ''),
+                        g('type', ''),
+                        g('condition', '')
                     ])
-                writer.writerow([])
+                writer.writerows(rows)
+                f.write('\r\n')
 
             # Filters
             if model.get('filters'):
                 writer.writerow(["FILTERS"])
                 writer.writerow(["Applies To", "Predicate", "Rationale"])
 
+                rows = []
                 for filt in model['filters']:
-                    writer.writerow([
-                        filt.get('applies_to', ''),
-                        filt.get('predicate', ''),
-                        filt.get('rationale', '')
+                    g = filt.get
+                    rows.append([
+                        g('applies_to', ''),
+                        g('predicate', ''),
+                        g('rationale', '')
                     ])
-                writer.writerow([])
+                writer.writerows(rows)
+                f.write('\r\n')
 
             # Constraints
-            if model.get('constraints'):
+            if entry['constraints']:
                 writer.writerow(["CONSTRAINTS"])
-                for key, value in model['constraints'].items():
-                    writer.writerow([key, str(value) if value else ''])
+                writer.writerows([[key, _constraint_cell(value)]
+                                        for key, value in entry['constraints'].items()])
+
+            filepath.write_bytes(f.getvalue().encode('utf-8'))
 
-        print(f"  ✓ {filepath.name}")
+        return filepath
 
 
 def main():
@@ -16,11 +16,25 @@ The generated Mermaid diagram can be:
 - Embedded in documentation
 """
 
+import functools
 import json
 import sys
 from pathlib import Path
 from typing import Any, Dict, List, Set
 
+try:
+    from ._spec_stream import STREAM_THRESHOLD_BYTES, _StreamedModels, ijson, orjson
+except ImportError:  # run as a script from the tools directory
+    from _spec_stream import STREAM_THRESHOLD_BYTES, _StreamedModels, ijson, orjson
+
+# Dots, hyphens and spaces all become underscores in Mermaid node IDs
+_SANITIZE_TABLE = str.maketrans({'.': '_', '-': '_', ' ': '_'})
+
+
+@functools.lru_cache(maxsize=1024)
+def _sanitize(name: str) -> str:
+    return name.translate(_SANITIZE_TABLE)
+
 
 class SpecToDiagramConverter:
     """Converts spec.json to Mermaid diagram for data flow visualization."""
@@ -28,29 +42,50 @@ class SpecToDiagramConverter:
     def __init__(self, spec_path: str):
         """Initialize converter with spec file path."""
         self.spec_path = Path(spec_path)
-        with open(self.spec_path, 'r') as f:
-            self.spec = json.load(f)
+        if ijson is not None and self.spec_path.stat().st_size > STREAM_THRESHOLD_BYTES:
+            self.models = _StreamedModels(self.spec_path)
+            self.spec = {'models': self.models}
+        else:
+            with open(self.spec_path, 'rb') as f:
+                self.spec = orjson.loads(f.read()) if orjson else json.load(f)
+            self.models = self.spec.get('models', []) or []
+
+        self._names: Set[str] = set()
+        self.staging_models: List[str] = []
+        self.final_models: List[str] = []
+        for m in self.models:
+            name = m.get('name', '')
+            self._names.add(name)
+            layer = m.get('layer', '')
+            if layer == 'staging':
+                self.staging_models.append(name)
+            elif layer == 'final':
+                self.final_models.append(name)
 
     def convert(self, output_path: str) -> None:
         """Main conversion method - creates Mermaid diagram."""
-        with open(output_path, 'w', encoding='utf-8') as f:
-            # Write title and description
-            f.write("# Data Pipeline Specification - Flow Diagram\n\n")
-            f.write(f"Generated from: `{self.spec_path.name}`\n\n")
-
+        # Title and description
+        parts: List[str] = [
+            "# Data Pipeline Specification - Flow Diagram\n\n",
+            f"Generated from: `{self.spec_path.name}`\n\n",
             # Main data flow diagram
-            f.write("## Data Flow\n\n")
-            f.write("```mermaid\n")
-            f.write(self._generate_data_flow())
-            f.write("```\n\n")
-
-            # Individual model diagrams
-            for model in self.spec.get('models', []):
-                if model.get('column_mapping') or model.get('aggregations'):
-                    f.write(f"## Model: {model.get('name', 'Unknown')}\n\n")
-                    f.write("```mermaid\n")
-                    f.write(self._generate_model_diagram(model))
-                    f.write("```\n\n")
+            "## Data Flow\n\n",
+            "```mermaid\n",
+            self._generate_data_flow(),
+            "```\n\n",
+        ]
+
+        # Individual model diagrams
+        for model in self.models:
+            if model.get('column_mapping') or model.get('aggregations'):
+                parts.append(f"## Model: {model.get('name', 'Unknown')}\n\n")
+                parts.append("```mermaid\n")
+                parts.append(self._generate_model_diagram(model))
+                parts.append("```\n\n")
+
+        # Assembled in memory and written with a single call
+        with open(output_path, 'w', encoding='utf-8') as f:
+            f.write("".join(parts))
 
         print(f"✓ Mermaid diagram created: {output_path}")
         print(f"\nTo view:")
@@ -62,24 +97,13 @@ class SpecToDiagramConverter:
         """Generate high-level data flow diagram."""
         lines = ["graph TD\n"]
 
-        # Track all sources and models
-        raw_sources: Set[str] = set()
-        staging_models: List[str] = []
-        final_models: List[str] = []
-
-        for model in self.spec.get('models', []):
-            model_name = model.get('name', '')
-            layer = model.get('layer', '')
-
-            if layer == 'staging':
-                staging_models.append(model_name)
-            elif layer == 'final':
-                final_models.append(model_name)
-
-            # Collect raw sources
-            for source in model.get('sources', []):
-                if source.startswith('raw.'):
-                    raw_sources.add(source)
+        # Collect raw sources; staging/final model lists are precomputed in __init__
+        raw_sources: Set[str] = {
+            source
+            for model in self.models
+            for source in model.get('sources', [])
+            if source.startswith('raw.')
+        }
 
         # Define raw sources
         for source in sorted(raw_sources):
@@ -87,26 +111,26 @@ class SpecToDiagramConverter:
             lines.append(f"    {safe_id}[({source})]:::rawSource\n")
 
         # Define staging models
-        for model in staging_models:
+        for model in self.staging_models:
             safe_id = self._sanitize_id(model)
             lines.append(f"    {safe_id}[[{model}]]:::staging\n")
 
         # Define final models
-        for model in final_models:
+        for model in self.final_models:
             safe_id = self._sanitize_id(model)
             lines.append(f"    {safe_id}[/{model}/]:::final\n")
 
         lines.append("\n")
 
         # Add connections
-        for model in self.spec.get('models', []):
+        for model in self.models:
             model_name = model.get('name', '')
             model_id = self._sanitize_id(model_name)
 
             for source in model.get('sources', []):
                 source_id = self._sanitize_id(source)
                 # Only show if source exists as a node
-                if source.startswith('raw.') or any(m.get('name') == source for m in self.spec.get('models', [])):
+                if source.startswith('raw.') or source in self._names:
                     lines.append(f"    {source_id} --> {model_id}\n")
 
         # Styling
@@ -153,11 +177,7 @@ class SpecToDiagramConverter:
             display_cols.append(f"... +{len(all_columns) - 10} more")
 
         if display_cols:
-            lines.append(f"    OUT[{model_name}<br/>")
-            for col in display_cols:
-                lines.append(f"• {col}<br/>")
-            lines[-1] = lines[-1].rstrip('<br/>')  # Remove last break
-            lines.append("]:::output\n")
+            lines.append(f"    OUT[{model_name}<br/>" + "<br/>".join(f"• {col}" for col in display_cols) + "]:::output\n")
 
         lines.append("\n")
 
@@ -186,8 +206,7 @@ class SpecToDiagramConverter:
 
     def _sanitize_id(self, name: str) -> str:
         """Sanitize name for use as Mermaid node ID."""
-        # Replace dots, hyphens, and special chars with underscores
-        return name.replace('.', '_').replace('-', '_').replace(' ', '_')
+        return _sanitize(name)
 
 
 def main():
@@ -13,11 +13,21 @@ Example:
 import json
 import sys
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional, Tuple
 import openpyxl
 from openpyxl import Workbook
-from openpyxl.styles import Font, PatternFill, Alignment, Border, Side
-from openpyxl.utils import get_column_letter
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Font, PatternFill, Alignment, Border, Side, NamedStyle
+from openpyxl.styles.fonts import DEFAULT_FONT
+
+try:
+    from ._spec_stream import orjson
+except ImportError:  # run as a script from the tools directory
+    from _spec_stream import orjson
+
+# Shared fallback for missing list fields, and a branch-free bool -> label lookup
+_EMPTY_TUPLE = ()
+_YESNO = ('No', 'Yes')
 
 
 class SpecToExcelConverter:
@@ -34,419 +44,409 @@ class SpecToExcelConverter:
         top=Side(style='thin'),
         bottom=Side(style='thin')
     )
+    TITLE_FONT_BIG = Font(size=16, bold=True, color="366092")
+    TITLE_FONT_MODEL = Font(size=14, bold=True, color="366092")
+    TITLE_FONT = Font(size=14, bold=True)
+    # Shared by every row; openpyxl dedupes styles anyway, but building them once saves the churn
+    BOLD_FONT = Font(bold=True)
+    HEADER_ALIGN_CENTER = Alignment(horizontal='center', vertical='center')
+    HEADER_ALIGN = Alignment(horizontal='center')
+    HEADER_ALIGN_WRAP = Alignment(horizontal='center', wrap_text=True)
+    BODY_ALIGN = Alignment(horizontal='left', vertical='top', wrap_text=True)
+    BODY_ALIGN_WRAP = Alignment(horizontal='left', wrap_text=True)
+    OVERVIEW_ALIGN = Alignment(horizontal='left', vertical='center')
+
+    # Named cell styles for table cells: (name, font, fill, alignment), all with BORDER.
+    # Registered once per workbook so each cell takes a single style assignment.
+    TABLE_STYLES = (
+        ('header', HEADER_FONT, HEADER_FILL, None),
+        ('header_center', HEADER_FONT, HEADER_FILL, HEADER_ALIGN),
+        ('header_center_middle', HEADER_FONT, HEADER_FILL, HEADER_ALIGN_CENTER),
+        ('header_center_wrap', HEADER_FONT, HEADER_FILL, HEADER_ALIGN_WRAP),
+        ('body', None, None, None),
+        ('body_top_wrap', None, None, BODY_ALIGN),
+        ('body_wrap', None, None, BODY_ALIGN_WRAP),
+        ('body_middle', None, None, OVERVIEW_ALIGN),
+    )
+
+    # Table headers per sheet / model sheet section
+    OVERVIEW_HEADERS = ("Model Name", "Layer", "Source Tables", "Target Columns", "Has Joins", "Has Aggregations")
+    SCHEMA_HEADERS = ("Configuration", "Value")
+    COL_MAP_HEADERS = ("Target Column", "Type", "From Table", "From Column", "Transform",
+                       "Nullable", "Tests", "Description")
+    AGG_HEADERS = ("Metric Column", "Type", "Formula", "Tests", "Description")
+    JOIN_HEADERS = ("Left Table", "Right Table", "Join Type", "Join Condition")
+    FILTER_HEADERS = ("Applies To", "Predicate", "Rationale")
+    ALL_COLUMNS_HEADERS = ("Model", "Layer", "Column Name", "Type", "Source", "Transform",
+                           "Nullable", "Tests", "Description")
+    LINEAGE_HEADERS = ("Model", "Layer", "Depends On (Sources)", "Used By (Downstream)")
+
+    # Column widths per sheet
+    OVERVIEW_WIDTHS = {'A': 20, 'B': 20, 'C': 40, 'D': 20, 'E': 20, 'F': 20}
+    SCHEMA_WIDTHS = {'A': 25, 'B': 25}
+    MODEL_WIDTHS = {'A': 20, 'B': 15, 'C': 20, 'D': 20, 'E': 35, 'F': 10, 'G': 20, 'H': 30}
+    ALL_COLUMNS_WIDTHS = {'A': 25, 'B': 12, 'C': 25, 'D': 12, 'E': 30, 'F': 40, 'G': 10, 'H': 20, 'I': 30}
+    LINEAGE_WIDTHS = {'A': 25, 'B': 12, 'C': 40, 'D': 40}
 
     def __init__(self, spec_path: str):
         """Initialize converter with spec file path."""
         self.spec_path = Path(spec_path)
-        with open(self.spec_path, 'r') as f:
-            self.spec = json.load(f)
-        self.wb = Workbook()
-        # Remove default sheet
-        if 'Sheet' in self.wb.sheetnames:
-            self.wb.remove(self.wb['Sheet'])
+        with open(self.spec_path, 'rb') as f:
+            self.spec = orjson.loads(f.read()) if orjson else json.load(f)
+        # Per-model fields shared by several sheets, computed once; 'raw' is the spec dict itself
+        self.model_cache = [self._model_entry(m) for m in self.spec.get('models') or _EMPTY_TUPLE]
+        self.model_names = frozenset(entry['name'] for entry in self.model_cache if entry['name'])
+        # Write-only workbooks stream each row to XML as it is appended instead of keeping
+        # every cell in memory until save; rows must therefore be written top to bottom and
+        # column widths set before the first row of a sheet
+        self.wb = Workbook(write_only=True)
+        for name, font, fill, alignment in self.TABLE_STYLES:
+            self.wb.add_named_style(NamedStyle(
+                name=name,
+                font=font or DEFAULT_FONT,
+                fill=fill or PatternFill(),
+                border=self.BORDER,
+                alignment=alignment or Alignment(),
+            ))
+
+    @staticmethod
+    def _model_entry(m: Dict[str, Any]) -> Dict[str, Any]:
+        sources = m.get('sources') or _EMPTY_TUPLE
+        return {
+            'name': m.get('name', ''),
+            'layer': m.get('layer', ''),
+            'sources': sources,
+            'joined_sources': ', '.join(sources),
+            'cols': m.get('column_mapping') or _EMPTY_TUPLE,
+            'aggs': m.get('aggregations') or _EMPTY_TUPLE,
+            'joins': m.get('joins') or _EMPTY_TUPLE,
+            'filters': m.get('filters') or _EMPTY_TUPLE,
+            'group_by': m.get('group_by') or _EMPTY_TUPLE,
+            'constraints': m.get('constraints') or {},
+            'raw': m,
+        }
 
     def convert(self, output_path: str) -> None:
         """Main conversion method - creates all sheets."""
-        self._create_overview_sheet()
+        # Sheets are built one after another on purpose: they share the workbook's style
+        # tables, which openpyxl does not guard against concurrent writers
         self._create_schema_sheet()
 
         # Create a sheet for each model
-        for idx, model in enumerate(self.spec.get('models', []), 1):
-            self._create_model_sheet(model, idx)
+        for idx, entry in enumerate(self.model_cache, 1):
+            self._create_model_sheet(entry, idx)
 
-        # Create summary sheets
-        self._create_all_columns_sheet()
-        self._create_data_lineage_sheet()
+        # Create summary sheets (Overview is inserted in front)
+        self._create_summary_sheets()
 
         # Save workbook
         self.wb.save(output_path)
         print(f"✓ Excel file created: {output_path}")
 
-    def _create_overview_sheet(self) -> None:
-        """Create overview/summary sheet."""
+    @staticmethod
+    def _cell(ws, value: Any, font=None, fill=None, alignment=None, border=None) -> WriteOnlyCell:
+        """Build a styled cell for ws.append()."""
+        cell = WriteOnlyCell(ws, value)
+        if font is not None:
+            cell.font = font
+        if fill is not None:
+            cell.fill = fill
+        if alignment is not None:
+            cell.alignment = alignment
+        if border is not None:
+            cell.border = border
+        return cell
+
+    def _write_title(self, ws, text: str, font: Font, span: Optional[str] = None, alignment=None) -> None:
+        """Append a sheet title and the blank row after it; span (e.g. 'A1:E1') merges the title."""
+        if span:
+            ws.merged_cells.add(span)
+        ws.append([self._cell(ws, text, font=font, alignment=alignment)])
+        ws.append(_EMPTY_TUPLE)
+
+    def _label_row(self, ws, label: str, value: Any) -> None:
+        """Append a bold 'Label:' cell followed by its plain value."""
+        ws.append((self._cell(ws, label, font=self.BOLD_FONT), value))
+
+    def _header_row(self, ws, headers: Tuple[str, ...], style: str = 'header') -> List[WriteOnlyCell]:
+        """Table header cells."""
+        return self._body_row(ws, headers, style)
+
+    @staticmethod
+    def _set_widths(ws, widths: Dict[str, int]) -> None:
+        """Apply column widths; must run before the sheet's first row is appended."""
+        dims = ws.column_dimensions
+        for letter, width in widths.items():
+            dims[letter].width = width
+
+    @staticmethod
+    def _body_row(ws, values, style: str = 'body') -> List[WriteOnlyCell]:
+        """Cells in one of the TABLE_STYLES, one per value."""
+        new_cell = WriteOnlyCell
+        row = []
+        for value in values:
+            cell = new_cell(ws, value)
+            cell.style = style
+            row.append(cell)
+        return row
+
+    def _create_summary_sheets(self) -> None:
+        """Fill the Overview, All Columns and Data Lineage sheets from one walk over the models."""
+        overview = self._create_overview_sheet()
+        all_columns = self._create_all_columns_sheet()
+        lineage = self._create_data_lineage_sheet()
+        downstream_map = self._build_downstream_map()
+
+        for entry in self.model_cache:
+            self._emit_overview_row(overview, entry)
+            self._emit_column_rows(all_columns, entry)
+            self._emit_lineage_row(lineage, entry, downstream_map)
+
+    def _create_overview_sheet(self):
+        """Create overview/summary sheet up to its table header; rows come from _emit_overview_row."""
         ws = self.wb.create_sheet("Overview", 0)
 
-        row = 1
+        # Auto-size columns
+        self._set_widths(ws, self.OVERVIEW_WIDTHS)
+
         # Title
-        ws.merge_cells(f'A{row}:E{row}')
-        cell = ws[f'A{row}']
-        cell.value = "Data Pipeline Specification - Overview"
-        cell.font = Font(size=16, bold=True, color="366092")
-        cell.alignment = Alignment(horizontal='center', vertical='center')
-        row += 2
+        self._write_title(ws, "Data Pipeline Specification - Overview", self.TITLE_FONT_BIG,
+                          span='A1:E1', alignment=self.HEADER_ALIGN_CENTER)
 
         # Metadata section
-        ws[f'A{row}'] = "Source File:"
-        ws[f'B{row}'] = str(self.spec_path.name)
-        ws[f'A{row}'].font = Font(bold=True)
-        row += 2
+        self._label_row(ws, "Source File:", str(self.spec_path.name))
+        ws.append(_EMPTY_TUPLE)
 
         # Models summary
-        ws[f'A{row}'] = "Models Summary"
-        ws[f'A{row}'].font = Font(size=14, bold=True)
-        row += 1
+        ws.append([self._cell(ws, "Models Summary", font=self.TITLE_FONT)])
 
         # Headers
-        headers = ["Model Name", "Layer", "Source Tables", "Target Columns", "Has Joins", "Has Aggregations"]
-        for col, header in enumerate(headers, 1):
-            cell = ws.cell(row, col, header)
-            cell.font = self.HEADER_FONT
-            cell.fill = self.HEADER_FILL
-            cell.alignment = Alignment(horizontal='center', vertical='center')
-            cell.border = self.BORDER
-        row += 1
-
-        # Model rows
-        for model in self.spec.get('models', []):
-            ws.cell(row, 1, model.get('name', ''))
-            ws.cell(row, 2, model.get('layer', ''))
-            ws.cell(row, 3, ', '.join(model.get('sources', [])))
-            ws.cell(row, 4, len(model.get('column_mapping', [])) + len(model.get('aggregations', []) or []))
-            ws.cell(row, 5, 'Yes' if model.get('joins') else 'No')
-            ws.cell(row, 6, 'Yes' if model.get('aggregations') else 'No')
-
-            for col in range(1, 7):
-                ws.cell(row, col).border = self.BORDER
-                ws.cell(row, col).alignment = Alignment(horizontal='left', vertical='center')
-            row += 1
-
-        # Auto-size columns
-        for col in range(1, 7):
-            ws.column_dimensions[get_column_letter(col)].width = 20
-
-        ws.column_dimensions['C'].width = 40
+        ws.append(self._header_row(ws, self.OVERVIEW_HEADERS, 'header_center_middle'))
+        return ws
+
+    def _emit_overview_row(self, ws, entry: Dict[str, Any]) -> None:
+        """Model overview row."""
+        values = (
+            entry['name'],
+            entry['layer'],
+            entry['joined_sources'],
+            len(entry['cols']) + len(entry['aggs']),
+            _YESNO[bool(entry['joins'])],
+            _YESNO[bool(entry['aggs'])],
+        )
+        ws.append(self._body_row(ws, values, 'body_middle'))
 
     def _create_schema_sheet(self) -> None:
         """Create schema configuration sheet."""
         ws = self.wb.create_sheet("Schema Config")
 
-        row = 1
-        ws[f'A{row}'] = "Schema Configuration"
-        ws[f'A{row}'].font = Font(size=14, bold=True)
-        row += 2
+        self._set_widths(ws, self.SCHEMA_WIDTHS)
+
+        self._write_title(ws, "Schema Configuration", self.TITLE_FONT)
 
         schema_config = self.spec.get('schema', {})
 
-        headers = ["Configuration", "Value"]
-        for col, header in enumerate(headers, 1):
-            cell = ws.cell(row, col, header)
-            cell.font = self.HEADER_FONT
-            cell.fill = self.HEADER_FILL
-            cell.border = self.BORDER
-        row += 1
+        ws.append(self._header_row(ws, self.SCHEMA_HEADERS))
 
         for key, value in schema_config.items():
-            ws.cell(row, 1, key)
-            ws.cell(row, 2, value)
-            for col in range(1, 3):
-                ws.cell(row, col).border = self.BORDER
-            row += 1
+            ws.append(self._body_row(ws, (key, value)))
 
-        ws.column_dimensions['A'].width = 25
-        ws.column_dimensions['B'].width = 25
-
-    def _create_model_sheet(self, model: Dict[str, Any], idx: int) -> None:
+    def _create_model_sheet(self, entry: Dict[str, Any], idx: int) -> None:
         """Create detailed sheet for each model."""
-        model_name = model.get('name', f'model_{idx}')
+        model_name = entry['raw'].get('name', f'model_{idx}')
         ws = self.wb.create_sheet(f"{idx}. {model_name[:25]}")
+        # Rows are streamed out one ws.append() each; bind the per-row calls once
+        append = ws.append
+        body_row = self._body_row
 
-        row = 1
+        # Auto-size columns
+        self._set_widths(ws, self.MODEL_WIDTHS)
 
         # Model header
-        ws.merge_cells(f'A{row}:H{row}')
-        cell = ws[f'A{row}']
-        cell.value = f"Model: {model_name}"
-        cell.font = Font(size=14, bold=True, color="366092")
-        cell.alignment = Alignment(horizontal='center')
-        row += 2
+        self._write_title(ws, f"Model: {model_name}", self.TITLE_FONT_MODEL,
+                          span='A1:H1', alignment=self.HEADER_ALIGN)
 
         # Basic info
-        ws[f'A{row}'] = "Layer:"
-        ws[f'B{row}'] = model.get('layer', '')
-        ws[f'A{row}'].font = Font(bold=True)
-        row += 1
+        self._label_row(ws, "Layer:", entry['layer'])
+        self._label_row(ws, "Source Tables:", entry['joined_sources'])
+        ws.append(_EMPTY_TUPLE)
 
-        ws[f'A{row}'] = "Source Tables:"
-        ws[f'B{row}'] = ', '.join(model.get('sources', []))
-        ws[f'A{row}'].font = Font(bold=True)
-        row += 2
+        # Skeleton models (common in staging) have nothing past the basic info
+        if not (entry['cols'] or entry['aggs'] or entry['group_by'] or entry['joins']
+                or entry['filters'] or entry['constraints']):
+            return
 
         # Column Mappings
-        if model.get('column_mapping'):
-            ws[f'A{row}'] = "Column Mappings"
-            ws[f'A{row}'].font = self.SUBHEADER_FONT
-            ws[f'A{row}'].fill = self.SUBHEADER_FILL
-            row += 1
-
-            headers = ["Target Column", "Type", "From Table", "From Column", "Transform",
-                      "Nullable", "Tests", "Description"]
-            for col, header in enumerate(headers, 1):
-                cell = ws.cell(row, col, header)
-                cell.font = self.HEADER_FONT
-                cell.fill = self.HEADER_FILL
-                cell.alignment = Alignment(horizontal='center', wrap_text=True)
-                cell.border = self.BORDER
-            row += 1
-
-            for col_map in model['column_mapping']:
-                ws.cell(row, 1, col_map.get('target_column', ''))
-                ws.cell(row, 2, col_map.get('type', ''))
-                ws.cell(row, 3, col_map.get('from_table', ''))
-                ws.cell(row, 4, col_map.get('from_column', ''))
-                ws.cell(row, 5, col_map.get('transform', '') or '')
-                ws.cell(row, 6, 'Yes' if col_map.get('nullable') else 'No')
-                ws.cell(row, 7, ', '.join(col_map.get('tests', [])))
-                ws.cell(row, 8, col_map.get('description', '') or '')
-
-                for col in range(1, 9):
-                    cell = ws.cell(row, col)
-                    cell.border = self.BORDER
-                    cell.alignment = Alignment(horizontal='left', vertical='top', wrap_text=True)
-                row += 1
-            row += 1
+        if entry['cols']:
+            ws.append([self._cell(ws, "Column Mappings", font=self.SUBHEADER_FONT, fill=self.SUBHEADER_FILL)])
+
+            ws.append(self._header_row(ws, self.COL_MAP_HEADERS, 'header_center_wrap'))
+
+            for col_map in entry['cols']:
+                values = (
+                    col_map.get('target_column', ''),
+                    col_map.get('type', ''),
+                    col_map.get('from_table', ''),
+                    col_map.get('from_column', ''),
+                    col_map.get('transform', '') or '',
+                    _YESNO[bool(col_map.get('nullable'))],
+                    ', '.join(col_map.get('tests') or _EMPTY_TUPLE),
+                    col_map.get('description', '') or '',
+                )
+                append(body_row(ws, values, 'body_top_wrap'))
+            ws.append(_EMPTY_TUPLE)
 
         # Aggregations
-        if model.get('aggregations'):
-            ws[f'A{row}'] = "Aggregations"
-            ws[f'A{row}'].font = self.SUBHEADER_FONT
-            ws[f'A{row}'].fill = self.SUBHEADER_FILL
-            row += 1
-
-            headers = ["Metric Column", "Type", "Formula", "Tests", "Description"]
-            for col, header in enumerate(headers, 1):
-                cell = ws.cell(row, col, header)
-                cell.font = self.HEADER_FONT
-                cell.fill = self.HEADER_FILL
-                cell.border = self.BORDER
-            row += 1
-
-            for agg in model['aggregations']:
-                ws.cell(row, 1, agg.get('metric_column', ''))
-                ws.cell(row, 2, agg.get('type', ''))
-                ws.cell(row, 3, agg.get('formula', ''))
-                ws.cell(row, 4, ', '.join(agg.get('tests', [])))
-                ws.cell(row, 5, agg.get('description', '') or '')
-
-                for col in range(1, 6):
-                    cell = ws.cell(row, col)
-                    cell.border = self.BORDER
-                    cell.alignment = Alignment(horizontal='left', vertical='top', wrap_text=True)
-                row += 1
-            row += 1
+        if entry['aggs']:
+            ws.append([self._cell(ws, "Aggregations", font=self.SUBHEADER_FONT, fill=self.SUBHEADER_FILL)])
+
+            ws.append(self._header_row(ws, self.AGG_HEADERS))
+
+            for agg in entry['aggs']:
+                values = (
+                    agg.get('metric_column', ''),
+                    agg.get('type', ''),
+                    agg.get('formula', ''),
+                    ', '.join(agg.get('tests') or _EMPTY_TUPLE),
+                    agg.get('description', '') or '',
+                )
+                append(body_row(ws, values, 'body_top_wrap'))
+            ws.append(_EMPTY_TUPLE)
 
         # Group By
-        if model.get('group_by'):
-            ws[f'A{row}'] = "Group By:"
-            ws[f'B{row}'] = ', '.join(model['group_by'])
-            ws[f'A{row}'].font = Font(bold=True)
-            row += 1
+        if entry['group_by']:
+            self._label_row(ws, "Group By:", ', '.join(entry['group_by']))
 
         # Joins
-        if model.get('joins'):
-            row += 1
-            ws[f'A{row}'] = "Joins"
-            ws[f'A{row}'].font = self.SUBHEADER_FONT
-            ws[f'A{row}'].fill = self.SUBHEADER_FILL
-            row += 1
-
-            headers = ["Left Table", "Right Table", "Join Type", "Join Condition"]
-            for col, header in enumerate(headers, 1):
-                cell = ws.cell(row, col, header)
-                cell.font = self.HEADER_FONT
-                cell.fill = self.HEADER_FILL
-                cell.border = self.BORDER
-            row += 1
-
-            for join in model['joins']:
-                ws.cell(row, 1, join.get('left_table', ''))
-                ws.cell(row, 2, join.get('right_table', ''))
-                ws.cell(row, 3, join.get('type', ''))
-                ws.cell(row, 4, join.get('condition', ''))
-
-                for col in range(1, 5):
-                    ws.cell(row, col).border = self.BORDER
-                row += 1
-            row += 1
+        if entry['joins']:
+            ws.append(_EMPTY_TUPLE)
+            ws.append([self._cell(ws, "Joins", font=self.SUBHEADER_FONT, fill=self.SUBHEADER_FILL)])
+
+            ws.append(self._header_row(ws, self.JOIN_HEADERS))
+
+            for join in entry['joins']:
+                values = (
+                    join.get('left_table', ''),
+                    join.get('right_table', ''),
+                    join.get('type', ''),
+                    join.get('condition', ''),
+                )
+                append(body_row(ws, values))
+            ws.append(_EMPTY_TUPLE)
 
         # Filters
-        if model.get('filters'):
-            ws[f'A{row}'] = "Filters"
-            ws[f'A{row}'].font = self.SUBHEADER_FONT
-            ws[f'A{row}'].fill = self.SUBHEADER_FILL
-            row += 1
-
-            headers = ["Applies To", "Predicate", "Rationale"]
-            for col, header in enumerate(headers, 1):
-                cell = ws.cell(row, col, header)
-                cell.font = self.HEADER_FONT
-                cell.fill = self.HEADER_FILL
-                cell.border = self.BORDER
-            row += 1
-
-            for filt in model['filters']:
-                ws.cell(row, 1, filt.get('applies_to', ''))
-                ws.cell(row, 2, filt.get('predicate', ''))
-                ws.cell(row, 3, filt.get('rationale', ''))
-
-                for col in range(1, 4):
-                    cell = ws.cell(row, col)
-                    cell.border = self.BORDER
-                    cell.alignment = Alignment(horizontal='left', wrap_text=True)
-                row += 1
-            row += 1
+        if entry['filters']:
+            ws.append([self._cell(ws, "Filters", font=self.SUBHEADER_FONT, fill=self.SUBHEADER_FILL)])
+
+            ws.append(self._header_row(ws, self.FILTER_HEADERS))
+
+            for filt in entry['filters']:
+                values = (
+                    filt.get('applies_to', ''),
+                    filt.get('predicate', ''),
+                    filt.get('rationale', ''),
+                )
+                append(body_row(ws, values, 'body_wrap'))
+            ws.append(_EMPTY_TUPLE)
 
         # Constraints
-        if model.get('constraints'):
-            row += 1
-            ws[f'A{row}'] = "Constraints"
-            ws[f'A{row}'].font = self.SUBHEADER_FONT
-            ws[f'A{row}'].fill = self.SUBHEADER_FILL
-            row += 1
-
-            for key, value in model['constraints'].items():
-                ws.cell(row, 1, key)
-                ws.cell(row, 2, str(value) if value else '')
-                ws.cell(row, 1).font = Font(bold=True)
-                ws.cell(row, 1).border = self.BORDER
-                ws.cell(row, 2).border = self.BORDER
-                row += 1
+        if entry['constraints']:
+            ws.append(_EMPTY_TUPLE)
+            ws.append([self._cell(ws, "Constraints", font=self.SUBHEADER_FONT, fill=self.SUBHEADER_FILL)])
 
-        # Auto-size columns
-        ws.column_dimensions['A'].width = 20
-        ws.column_dimensions['B'].width = 15
-        ws.column_dimensions['C'].width = 20
-        ws.column_dimensions['D'].width = 20
-        ws.column_dimensions['E'].width = 35
-        ws.column_dimensions['F'].width = 10
-        ws.column_dimensions['G'].width = 20
-        ws.column_dimensions['H'].width = 30
-
-    def _create_all_columns_sheet(self) -> None:
-        """Create a consolidated view of all columns across all models."""
-        ws = self.wb.create_sheet("All Columns")
+            for key, value in entry['constraints'].items():
+                ws.append([self._cell(ws, key, font=self.BOLD_FONT, border=self.BORDER),
+                           self._cell(ws, str(value) if value else '', border=self.BORDER)])
 
-        row = 1
-        ws[f'A{row}'] = "All Columns Across Models"
-        ws[f'A{row}'].font = Font(size=14, bold=True)
-        row += 2
-
-        headers = ["Model", "Layer", "Column Name", "Type", "Source", "Transform",
-                   "Nullable", "Tests", "Description"]
-        for col, header in enumerate(headers, 1):
-            cell = ws.cell(row, col, header)
-            cell.font = self.HEADER_FONT
-            cell.fill = self.HEADER_FILL
-            cell.alignment = Alignment(horizontal='center')
-            cell.border = self.BORDER
-        row += 1
-
-        for model in self.spec.get('models', []):
-            model_name = model.get('name', '')
-            layer = model.get('layer', '')
-
-            # Column mappings
-            for col_map in model.get('column_mapping', []):
-                ws.cell(row, 1, model_name)
-                ws.cell(row, 2, layer)
-                ws.cell(row, 3, col_map.get('target_column', ''))
-                ws.cell(row, 4, col_map.get('type', ''))
-
-                from_table = col_map.get('from_table', '')
-                from_col = col_map.get('from_column', '')
-                source = f"{from_table}.{from_col}" if from_table and from_col else ''
-                ws.cell(row, 5, source)
-
-                ws.cell(row, 6, col_map.get('transform', '') or '')
-                ws.cell(row, 7, 'Yes' if col_map.get('nullable') else 'No')
-                ws.cell(row, 8, ', '.join(col_map.get('tests', [])))
-                ws.cell(row, 9, col_map.get('description', '') or '')
-
-                for col in range(1, 10):
-                    cell = ws.cell(row, col)
-                    cell.border = self.BORDER
-                    cell.alignment = Alignment(horizontal='left', vertical='top', wrap_text=True)
-                row += 1
-
-            # Aggregations
-            for agg in model.get('aggregations', []) or []:
-                ws.cell(row, 1, model_name)
-                ws.cell(row, 2, layer)
-                ws.cell(row, 3, agg.get('metric_column', ''))
-                ws.cell(row, 4, agg.get('type', ''))
-                ws.cell(row, 5, 'AGGREGATION')
-                ws.cell(row, 6, agg.get('formula', ''))
-                ws.cell(row, 7, '')
-                ws.cell(row, 8, ', '.join(agg.get('tests', [])))
-                ws.cell(row, 9, agg.get('description', '') or '')
-
-                for col in range(1, 10):
-                    cell = ws.cell(row, col)
-                    cell.border = self.BORDER
-                    cell.alignment = Alignment(horizontal='left', vertical='top', wrap_text=True)
-                row += 1
+    def _create_all_columns_sheet(self):
+        """Create a consolidated view of all columns across all models; rows come from _emit_column_rows."""
+        ws = self.wb.create_sheet("All Columns")
 
         # Auto-size
-        ws.column_dimensions['A'].width = 25
-        ws.column_dimensions['B'].width = 12
-        ws.column_dimensions['C'].width = 25
-        ws.column_dimensions['D'].width = 12
-        ws.column_dimensions['E'].width = 30
-        ws.column_dimensions['F'].width = 40
-        ws.column_dimensions['G'].width = 10
-        ws.column_dimensions['H'].width = 20
-        ws.column_dimensions['I'].width = 30
-
-    def _create_data_lineage_sheet(self) -> None:
-        """Create data lineage/dependency view."""
+        self._set_widths(ws, self.ALL_COLUMNS_WIDTHS)
+
+        self._write_title(ws, "All Columns Across Models", self.TITLE_FONT)
+
+        ws.append(self._header_row(ws, self.ALL_COLUMNS_HEADERS, 'header_center'))
+        return ws
+
+    def _emit_column_rows(self, ws, entry: Dict[str, Any]) -> None:
+        """Consolidated column rows for one model."""
+        # One row per column; bind the per-row calls once
+        append = ws.append
+        body_row = self._body_row
+        style = 'body_top_wrap'
+        model_name = entry['name']
+        layer = entry['layer']
+
+        # Column mappings
+        for col_map in entry['cols']:
+            from_table = col_map.get('from_table', '')
+            from_col = col_map.get('from_column', '')
+            source = f"{from_table}.{from_col}" if from_table and from_col else ''
+
+            values = (
+                model_name,
+                layer,
+                col_map.get('target_column', ''),
+                col_map.get('type', ''),
+                source,
+                col_map.get('transform', '') or '',
+                _YESNO[bool(col_map.get('nullable'))],
+                ', '.join(col_map.get('tests') or _EMPTY_TUPLE),
+                col_map.get('description', '') or '',
+            )
+            append(body_row(ws, values, style))
+
+        # Aggregations
+        for agg in entry['aggs']:
+            values = (
+                model_name,
+                layer,
+                agg.get('metric_column', ''),
+                agg.get('type', ''),
+                'AGGREGATION',
+                agg.get('formula', ''),
+                '',
+                ', '.join(agg.get('tests') or _EMPTY_TUPLE),
+                agg.get('description', '') or '',
+            )
+            append(body_row(ws, values, style))
+
+    def _create_data_lineage_sheet(self):
+        """Create data lineage/dependency view; rows come from _emit_lineage_row."""
         ws = self.wb.create_sheet("Data Lineage")
 
-        row = 1
-        ws[f'A{row}'] = "Data Lineage & Dependencies"
-        ws[f'A{row}'].font = Font(size=14, bold=True)
-        row += 2
-
-        headers = ["Model", "Layer", "Depends On (Sources)", "Used By (Downstream)"]
-        for col, header in enumerate(headers, 1):
-            cell = ws.cell(row, col, header)
-            cell.font = self.HEADER_FONT
-            cell.fill = self.HEADER_FILL
-            cell.alignment = Alignment(horizontal='center')
-            cell.border = self.BORDER
-        row += 1
-
-        # Build dependency map
-        model_names = {m['name'] for m in self.spec.get('models', [])}
-        downstream_map = {name: [] for name in model_names}
-
-        for model in self.spec.get('models', []):
-            for source in model.get('sources', []):
-                # Extract model name from source (e.g., "stg_customers" from sources)
-                for potential_upstream in model_names:
-                    if potential_upstream in source:
-                        downstream_map[potential_upstream].append(model['name'])
-
-        # Write lineage
-        for model in self.spec.get('models', []):
-            model_name = model.get('name', '')
-            layer = model.get('layer', '')
-            sources = ', '.join(model.get('sources', []))
-            downstream = ', '.join(sorted(set(downstream_map.get(model_name, []))))
-
-            ws.cell(row, 1, model_name)
-            ws.cell(row, 2, layer)
-            ws.cell(row, 3, sources)
-            ws.cell(row, 4, downstream)
-
-            for col in range(1, 5):
-                cell = ws.cell(row, col)
-                cell.border = self.BORDER
-                cell.alignment = Alignment(horizontal='left', vertical='top', wrap_text=True)
-            row += 1
-
-        ws.column_dimensions['A'].width = 25
-        ws.column_dimensions['B'].width = 12
-        ws.column_dimensions['C'].width = 40
-        ws.column_dimensions['D'].width = 40
+        self._set_widths(ws, self.LINEAGE_WIDTHS)
+
+        self._write_title(ws, "Data Lineage & Dependencies", self.TITLE_FONT)
+
+        ws.append(self._header_row(ws, self.LINEAGE_HEADERS, 'header_center'))
+        return ws
+
+    def _build_downstream_map(self) -> Dict[str, set]:
+        """Map each model name to the models that read from it."""
+        model_names = self.model_names
+        downstream_map = {name: set() for name in model_names}
+
+        for entry in self.model_cache:
+            for source in entry['sources']:
+                # A source names a model either outright or as a dotted part (e.g. temp.stg_orders);
+                # set lookups instead of substring tests, so stg_customer no longer matches stg_customers
+                for upstream in model_names.intersection((source, *source.split('.'))):
+                    downstream_map[upstream].add(entry['name'])
+        return downstream_map
+
+    def _emit_lineage_row(self, ws, entry: Dict[str, Any], downstream_map: Dict[str, set]) -> None:
+        """Data lineage row."""
+        model_name = entry['name']
+        values = (
+            model_name,
+            entry['layer'],
+            entry['joined_sources'],
+            ', '.join(sorted(downstream_map.get(model_name, ()))),
+        )
+        ws.append(self._body_row(ws, values, 'body_top_wrap'))
 
 
 def main():
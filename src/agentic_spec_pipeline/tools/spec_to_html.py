@@ -10,289 +10,305 @@ Example:
     python spec_to_html.py examples/technical_requirements/spec.json
 """
 
+import functools
+import io
 import json
+import os
+import shlex
+import subprocess
 import sys
 from pathlib import Path
-from typing import Any, Dict
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator, List, Optional, Sequence
 
+try:
+    from ._spec_stream import orjson
+except ImportError:  # run as a script from the tools directory
+    from _spec_stream import orjson
 
-class SpecToHTMLConverter:
-    """Converts spec.json to standalone HTML with embedded Mermaid diagrams."""
-
-    def __init__(self, spec_path: str):
-        """Initialize converter with spec file path."""
-        self.spec_path = Path(spec_path)
-        with open(self.spec_path, 'r') as f:
-            self.spec = json.load(f)
-
-    def convert(self, output_path: str) -> None:
-        """Main conversion method - creates standalone HTML."""
-        html = self._generate_html()
-
-        with open(output_path, 'w', encoding='utf-8') as f:
-            f.write(html)
+# Command that reads Mermaid source on stdin and prints SVG (e.g. an mmdr wrapper); when unset the
+# diagram is left to mermaid.js in the browser
+MERMAID_SVG_CMD = os.getenv("ASP_MERMAID_SVG_CMD", "")
 
-        print(f"✓ HTML file created: {output_path}")
-        print(f"\nTo view:")
-        print(f"  • Open {output_path} in any web browser")
-        print(f"  • Diagrams will render automatically (uses mermaid.js CDN)")
 
-    def _generate_toc_items(self, models) -> str:
-        """Generate table of contents items for models."""
-        items = []
-        for i, model in enumerate(models):
-            name = model.get("name", "Unknown")
-            items.append(f'                        <li><a href="#model-{i}">{name}</a></li>')
-        return '\n'.join(items)
+@functools.lru_cache(maxsize=32)
+def _load_spec(path: str, mtime_ns: int, size: int) -> Dict[str, Any]:
+    """Parse spec.json; keyed on mtime and size so an edited file is re-read. Treat as read-only."""
+    with open(path, 'rb') as f:
+        return orjson.loads(f.read()) if orjson else json.load(f)
 
-    def _generate_html(self) -> str:
-        """Generate complete HTML document."""
-        models = self.spec.get('models', [])
 
-        html = f"""<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>Data Pipeline Specification - {self.spec_path.stem}</title>
-    <script src="https://cdn.jsdelivr.net/npm/mermaid@10/dist/mermaid.min.js"></script>
-    <style>
-        * {{
+def _render_mermaid_svg(source: str) -> Optional[str]:
+    """Pre-render Mermaid source with MERMAID_SVG_CMD; None if unset or the renderer fails."""
+    if not MERMAID_SVG_CMD:
+        return None
+    try:
+        result = subprocess.run(
+            shlex.split(MERMAID_SVG_CMD), input=source.encode('utf-8'),
+            capture_output=True, check=True, timeout=120,
+        )
+    except (OSError, subprocess.SubprocessError) as e:
+        print(f"Warning: Mermaid pre-render failed, using mermaid.js instead: {e}", file=sys.stderr)
+        return None
+    return result.stdout.decode('utf-8').strip()
+
+
+# Static stylesheet, kept out of the f-strings so its braces need no escaping
+_CSS = """        * {
             margin: 0;
             padding: 0;
             box-sizing: border-box;
-        }}
+        }
 
-        body {{
+        body {
             font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, Oxygen, Ubuntu, Cantarell, sans-serif;
             line-height: 1.6;
             color: #333;
             background: #f5f5f5;
             padding: 20px;
-        }}
+        }
 
-        .container {{
+        .container {
             max-width: 1400px;
             margin: 0 auto;
             background: white;
             padding: 40px;
             border-radius: 8px;
             box-shadow: 0 2px 8px rgba(0,0,0,0.1);
-        }}
+        }
 
-        h1 {{
+        h1 {
             color: #1a1a1a;
             font-size: 2.5em;
             margin-bottom: 10px;
             border-bottom: 4px solid #366092;
             padding-bottom: 10px;
-        }}
+        }
 
-        h2 {{
+        h2 {
             color: #366092;
             font-size: 1.8em;
             margin-top: 40px;
             margin-bottom: 20px;
             padding-bottom: 8px;
             border-bottom: 2px solid #dce6f1;
-        }}
+        }
 
-        h3 {{
+        h3 {
             color: #555;
             font-size: 1.3em;
             margin-top: 30px;
             margin-bottom: 15px;
-        }}
+        }
 
-        .metadata {{
+        .metadata {
             background: #f8f9fa;
             padding: 15px 20px;
             border-radius: 4px;
             margin-bottom: 30px;
             border-left: 4px solid #366092;
-        }}
+        }
 
-        .metadata p {{
+        .metadata p {
             margin: 5px 0;
-        }}
+        }
 
-        .metadata strong {{
+        .metadata strong {
             color: #366092;
-        }}
+        }
 
-        table {{
+        table {
             width: 100%;
             border-collapse: collapse;
             margin: 20px 0;
             background: white;
             box-shadow: 0 1px 3px rgba(0,0,0,0.1);
-        }}
+        }
 
-        thead {{
+        thead {
             background: #366092;
             color: white;
-        }}
+        }
 
-        th {{
+        th {
             padding: 12px;
             text-align: left;
             font-weight: 600;
-        }}
+        }
 
-        td {{
+        td {
             padding: 12px;
             border-bottom: 1px solid #e0e0e0;
-        }}
+        }
 
-        tbody tr:hover {{
+        tbody tr:hover {
             background: #f8f9fa;
-        }}
+        }
 
-        .diagram-container {{
+        .diagram-container {
             background: white;
             padding: 20px;
             margin: 20px 0;
             border-radius: 4px;
             border: 1px solid #e0e0e0;
-        }}
+        }
 
-        .model-section {{
+        .model-section {
             background: #fafafa;
             padding: 25px;
             margin: 30px 0;
             border-radius: 6px;
             border-left: 4px solid #4caf50;
-        }}
+        }
 
-        .layer-badge {{
+        .layer-badge {
             display: inline-block;
             padding: 4px 12px;
             border-radius: 12px;
             font-size: 0.85em;
             font-weight: 600;
             margin-left: 10px;
-        }}
+        }
 
-        .layer-staging {{
+        .layer-staging {
             background: #bbdefb;
             color: #01579b;
-        }}
+        }
 
-        .layer-final {{
+        .layer-final {
             background: #c8e6c9;
             color: #2e7d32;
-        }}
+        }
 
-        code {{
+        code {
             background: #f5f5f5;
             padding: 2px 6px;
             border-radius: 3px;
             font-family: 'Monaco', 'Courier New', monospace;
             font-size: 0.9em;
-        }}
+        }
 
-        pre {{
+        pre {
             background: #f5f5f5;
             padding: 15px;
             border-radius: 4px;
             overflow-x: auto;
             border-left: 4px solid #366092;
-        }}
+        }
 
-        .toc {{
+        .toc {
             background: #f8f9fa;
             padding: 20px;
             border-radius: 4px;
             margin-bottom: 30px;
-        }}
+        }
 
-        .toc ul {{
+        .toc ul {
             list-style: none;
             padding-left: 20px;
-        }}
+        }
 
-        .toc li {{
+        .toc li {
             margin: 8px 0;
-        }}
+        }
 
-        .toc a {{
+        .toc a {
             color: #366092;
             text-decoration: none;
             font-weight: 500;
-        }}
+        }
 
-        .toc a:hover {{
+        .toc a:hover {
             text-decoration: underline;
-        }}
-    </style>
+        }
+"""
+
+
+# Static document skeleton around the dynamic fragments yielded by _stream_html()
+_HTML_HEAD = """<!DOCTYPE html>
+<html lang="en">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+"""
+
+_MERMAID_SCRIPT = """    <script src="https://cdn.jsdelivr.net/npm/mermaid@10/dist/mermaid.min.js"></script>
+"""
+
+_HTML_BODY_OPEN = "    <style>\n" + _CSS + """    </style>
 </head>
 <body>
     <div class="container">
         <h1>Data Pipeline Specification</h1>
 
-        <div class="metadata">
-            <p><strong>Source File:</strong> <code>{self.spec_path.name}</code></p>
-            <p><strong>Total Models:</strong> {len(models)}</p>
-            <p><strong>Generated:</strong> <span id="timestamp"></span></p>
-        </div>
+"""
 
-        <nav class="toc">
+_TOC_HEAD = """        <nav class="toc">
             <h3>Table of Contents</h3>
             <ul>
                 <li><a href="#overview">Overview</a></li>
                 <li><a href="#data-flow">Data Flow Diagram</a></li>
                 <li><a href="#models">Models</a>
                     <ul>
-{self._generate_toc_items(models)}
+"""
+
+_TOC_TAIL = """
                     </ul>
                 </li>
             </ul>
         </nav>
 
         <h2 id="overview">Overview</h2>
-        {self._generate_overview_table()}
+        """
+
+_FLOW_HEAD = """
 
         <h2 id="data-flow">Data Flow Diagram</h2>
         <div class="diagram-container">
-            <pre class="mermaid">
-{self._generate_mermaid_flow()}
-            </pre>
+"""
+
+_SECTIONS_HEAD = """
         </div>
 
         <h2 id="models">Models</h2>
-        {self._generate_model_sections()}
+        """
+
+_HTML_TAIL_OPEN = """
 
     </div>
 
     <script>
-        mermaid.initialize({{ startOnLoad: true, theme: 'default' }});
-        document.getElementById('timestamp').textContent = new Date().toLocaleString();
+"""
+
+_MERMAID_INIT = """        mermaid.initialize({ startOnLoad: true, theme: 'default' });
+"""
+
+_HTML_TAIL = """        document.getElementById('timestamp').textContent = new Date().toLocaleString();
     </script>
 </body>
 </html>
 """
-        return html
 
-    def _generate_overview_table(self) -> str:
-        """Generate overview table HTML."""
-        rows = []
-        for model in self.spec.get('models', []):
-            layer = model.get('layer', '')
-            badge_class = f'layer-{layer}' if layer else ''
-            total_cols = len(model.get('column_mapping', [])) + len(model.get('aggregations', []) or [])
 
-            rows.append(f"""
-            <tr>
-                <td><strong>{model.get('name', '')}</strong></td>
-                <td><span class="layer-badge {badge_class}">{layer}</span></td>
-                <td>{', '.join(model.get('sources', []))}</td>
-                <td>{total_cols}</td>
-                <td>{'Yes' if model.get('joins') else 'No'}</td>
-                <td>{'Yes' if model.get('aggregations') else 'No'}</td>
-            </tr>
-            """)
+# Markup characters in spec fields, escaped in one C-level pass
+_HTML_ESCAPE = str.maketrans({'&': '&amp;', '<': '&lt;', '>': '&gt;', '"': '&quot;'})
 
-        return f"""
+
+def _h(value: Any) -> str:
+    """HTML-escape a spec field for text or double-quoted attribute content."""
+    return '' if value is None else str(value).translate(_HTML_ESCAPE)
+
+
+# Dots and hyphens become underscores in Mermaid node IDs
+_SAFE_ID = str.maketrans('.-', '__')
+
+# Styling lines closing the data flow diagram
+_FLOW_CLASS_DEFS = """    classDef rawSource fill:#f9f,stroke:#333,stroke-width:2px
+    classDef staging fill:#bbf,stroke:#333,stroke-width:2px
+    classDef final fill:#bfb,stroke:#333,stroke-width:3px"""
+
+# Static table markup, built once at import; only the row cells are formatted per call
+_OVERVIEW_TABLE_HEAD = """
         <table>
             <thead>
                 <tr>
@@ -305,92 +321,9 @@ class SpecToHTMLConverter:
                 </tr>
             </thead>
             <tbody>
-                {''.join(rows)}
-            </tbody>
-        </table>
-        """
-
-    def _generate_mermaid_flow(self) -> str:
-        """Generate Mermaid data flow diagram."""
-        lines = ["graph TD"]
-
-        raw_sources = set()
-        for model in self.spec.get('models', []):
-            for source in model.get('sources', []):
-                if source.startswith('raw.'):
-                    raw_sources.add(source)
-
-        # Define nodes
-        for source in sorted(raw_sources):
-            safe_id = source.replace('.', '_').replace('-', '_')
-            lines.append(f"    {safe_id}[({source})]:::rawSource")
+                """
 
-        for model in self.spec.get('models', []):
-            name = model.get('name', '')
-            layer = model.get('layer', '')
-            safe_id = name.replace('.', '_').replace('-', '_')
-
-            if layer == 'staging':
-                lines.append(f"    {safe_id}[[{name}]]:::staging")
-            elif layer == 'final':
-                lines.append(f"    {safe_id}[/{name}/]:::final")
-
-        lines.append("")
-
-        # Add connections
-        for model in self.spec.get('models', []):
-            model_id = model.get('name', '').replace('.', '_').replace('-', '_')
-            for source in model.get('sources', []):
-                source_id = source.replace('.', '_').replace('-', '_')
-                lines.append(f"    {source_id} --> {model_id}")
-
-        lines.append("")
-        lines.append("    classDef rawSource fill:#f9f,stroke:#333,stroke-width:2px")
-        lines.append("    classDef staging fill:#bbf,stroke:#333,stroke-width:2px")
-        lines.append("    classDef final fill:#bfb,stroke:#333,stroke-width:3px")
-
-        return "\n".join(lines)
-
-    def _generate_model_sections(self) -> str:
-        """Generate HTML for all model sections."""
-        sections = []
-
-        for i, model in enumerate(self.spec.get('models', [])):
-            layer = model.get('layer', '')
-            badge_class = f'layer-{layer}' if layer else ''
-
-            sections.append(f"""
-        <div class="model-section" id="model-{i}">
-            <h3>{model.get('name', 'Unknown')} <span class="layer-badge {badge_class}">{layer}</span></h3>
-
-            <p><strong>Sources:</strong> {', '.join(f'<code>{s}</code>' for s in model.get('sources', []))}</p>
-
-            {self._generate_columns_table(model) if model.get('column_mapping') else ''}
-            {self._generate_aggregations_table(model) if model.get('aggregations') else ''}
-            {self._generate_joins_table(model) if model.get('joins') else ''}
-        </div>
-            """)
-
-        return ''.join(sections)
-
-    def _generate_columns_table(self, model: Dict[str, Any]) -> str:
-        """Generate columns table for a model."""
-        rows = []
-        for col in model.get('column_mapping', []):
-            transform = col.get('transform', '') or ''
-            transform_display = f'<code>{transform[:100]}...</code>' if len(transform) > 100 else f'<code>{transform}</code>' if transform else ''
-
-            rows.append(f"""
-            <tr>
-                <td><strong>{col.get('target_column', '')}</strong></td>
-                <td>{col.get('type', '')}</td>
-                <td><code>{col.get('from_table', '')}.{col.get('from_column', '')}</code></td>
-                <td>{transform_display}</td>
-                <td>{col.get('description', '') or ''}</td>
-            </tr>
-            """)
-
-        return f"""
+_COLUMNS_TABLE_HEAD = """
         <h4>Columns</h4>
         <table>
             <thead>
@@ -403,25 +336,9 @@ class SpecToHTMLConverter:
                 </tr>
             </thead>
             <tbody>
-                {''.join(rows)}
-            </tbody>
-        </table>
-        """
-
-    def _generate_aggregations_table(self, model: Dict[str, Any]) -> str:
-        """Generate aggregations table for a model."""
-        rows = []
-        for agg in model.get('aggregations', []):
-            rows.append(f"""
-            <tr>
-                <td><strong>{agg.get('metric_column', '')}</strong></td>
-                <td>{agg.get('type', '')}</td>
-                <td><code>{agg.get('formula', '')}</code></td>
-                <td>{agg.get('description', '') or ''}</td>
-            </tr>
-            """)
+                """
 
-        return f"""
+_AGGREGATIONS_TABLE_HEAD = """
         <h4>Aggregations</h4>
         <table>
             <thead>
@@ -433,25 +350,9 @@ class SpecToHTMLConverter:
                 </tr>
             </thead>
             <tbody>
-                {''.join(rows)}
-            </tbody>
-        </table>
-        """
+                """
 
-    def _generate_joins_table(self, model: Dict[str, Any]) -> str:
-        """Generate joins table for a model."""
-        rows = []
-        for join in model.get('joins', []):
-            rows.append(f"""
-            <tr>
-                <td><code>{join.get('left_table', '')}</code></td>
-                <td><code>{join.get('right_table', '')}</code></td>
-                <td>{join.get('type', '')}</td>
-                <td><code>{join.get('condition', '')}</code></td>
-            </tr>
-            """)
-
-        return f"""
+_JOINS_TABLE_HEAD = """
         <h4>Joins</h4>
         <table>
             <thead>
@@ -463,12 +364,243 @@ class SpecToHTMLConverter:
                 </tr>
             </thead>
             <tbody>
-                {''.join(rows)}
+                """
+
+_TABLE_FOOT = """
             </tbody>
         </table>
         """
 
 
+@dataclass
+class _SpecWalk:
+    """TOC, overview and flow fragments gathered in one pass over spec['models'].
+
+    Model sections are not collected here; _stream_html() yields them one at a time.
+    """
+    # TOC lines and Mermaid edges are written straight into buffers as the walk goes
+    toc: io.StringIO = field(default_factory=io.StringIO)
+    overview_rows: List[str] = field(default_factory=list)
+    # Newline-terminated node lines keyed by raw source name / model node ID, so repeats are declared once
+    raw_nodes: Dict[str, str] = field(default_factory=dict)
+    mermaid_nodes: Dict[str, str] = field(default_factory=dict)
+    mermaid_edges: io.StringIO = field(default_factory=io.StringIO)
+    # Mermaid-safe ID per model/source name, so each name is translated once
+    ids: Dict[str, str] = field(default_factory=dict)
+
+
+class SpecToHTMLConverter:
+    """Converts spec.json to standalone HTML with embedded Mermaid diagrams."""
+
+    def __init__(self, spec_path: str):
+        """Initialize converter with spec file path."""
+        self.spec_path = Path(spec_path)
+        # Repeat conversions of an unchanged spec in one process reuse the parsed dict
+        st = self.spec_path.stat()
+        self.spec = _load_spec(str(self.spec_path), st.st_mtime_ns, st.st_size)
+        # Set by _stream_html once it knows whether the flow diagram was pre-rendered
+        self.svg_embedded = False
+
+    def convert(self, output_path: str) -> None:
+        """Main conversion method - creates standalone HTML."""
+        # Written piece by piece; beyond the TOC, overview and flow, only one model section is held at a time
+        with open(output_path, 'w', encoding='utf-8') as f:
+            f.writelines(self._stream_html())
+
+        print(f"✓ HTML file created: {output_path}")
+        print(f"\nTo view:")
+        print(f"  • Open {output_path} in any web browser")
+        if self.svg_embedded:
+            print(f"  • Diagrams are pre-rendered SVG and work offline")
+        else:
+            print(f"  • Diagrams will render automatically (uses mermaid.js CDN)")
+
+    def _generate_html(self) -> str:
+        """Generate complete HTML document."""
+        return ''.join(self._stream_html())
+
+    def _walk_spec(self, models: Sequence[Dict[str, Any]]) -> _SpecWalk:
+        """Build the TOC, overview and flow fragments in a single pass over the models."""
+        # One overview row per model, so the list is sized up front
+        walk = _SpecWalk(overview_rows=[''] * len(models))
+        ids, raw_nodes, nodes = walk.ids, walk.raw_nodes, walk.mermaid_nodes
+        toc_write, edge_write = walk.toc.write, walk.mermaid_edges.write
+        for i, model in enumerate(models):
+            # Fields are read once here and shared by every fragment below
+            name = model.get('name', '')
+            title = model.get('name', 'Unknown')
+            layer = model.get('layer', '')
+            sources = model.get('sources', [])
+            # Escaped copies for the HTML fragments; the Mermaid source uses the raw values
+            h_name, h_title, h_layer = _h(name), _h(title), _h(layer)
+            badge_class = f'layer-{h_layer}' if layer else ''
+            cols = model.get('column_mapping') or ()
+            aggs = model.get('aggregations') or ()
+            joins = model.get('joins') or ()
+
+            if i:
+                toc_write('\n')
+            toc_write(f'                        <li><a href="#model-{i}">{h_title}</a></li>')
+            walk.overview_rows[i] = f"""
+            <tr>
+                <td><strong>{h_name}</strong></td>
+                <td><span class="layer-badge {badge_class}">{h_layer}</span></td>
+                <td>{', '.join(map(_h, sources))}</td>
+                <td>{len(cols) + len(aggs)}</td>
+                <td>{'Yes' if joins else 'No'}</td>
+                <td>{'Yes' if aggs else 'No'}</td>
+            </tr>
+            """
+
+            safe_id = ids.get(name)
+            if safe_id is None:
+                safe_id = ids[name] = name.translate(_SAFE_ID)
+            if layer == 'staging':
+                nodes.setdefault(safe_id, f"    {safe_id}[[{name}]]:::staging\n")
+            elif layer == 'final':
+                nodes.setdefault(safe_id, f"    {safe_id}[/{name}/]:::final\n")
+            for source in sources:
+                source_id = ids.get(source)
+                if source_id is None:
+                    source_id = ids[source] = source.translate(_SAFE_ID)
+                if source.startswith('raw.') and source not in raw_nodes:
+                    raw_nodes[source] = f"    {source_id}[({source})]:::rawSource\n"
+                edge_write(f"    {source_id} --> {safe_id}\n")
+
+        return walk
+
+    def _stream_html(self) -> Iterator[str]:
+        """Yield the HTML document section by section, so convert() can write it as it goes."""
+        models = self.spec.get('models', [])
+        walk = self._walk_spec(models)
+        flow = self._generate_mermaid_flow(walk)
+        svg = _render_mermaid_svg(flow)
+        self.svg_embedded = svg is not None
+
+        yield _HTML_HEAD
+        yield f"    <title>Data Pipeline Specification - {_h(self.spec_path.stem)}</title>\n"
+        if svg is None:
+            yield _MERMAID_SCRIPT
+        yield _HTML_BODY_OPEN
+        yield f"""        <div class="metadata">
+            <p><strong>Source File:</strong> <code>{_h(self.spec_path.name)}</code></p>
+            <p><strong>Total Models:</strong> {len(models)}</p>
+            <p><strong>Generated:</strong> <span id="timestamp"></span></p>
+        </div>
+
+"""
+        yield _TOC_HEAD
+        yield walk.toc.getvalue()
+        yield _TOC_TAIL
+        yield _OVERVIEW_TABLE_HEAD
+        yield ''.join(walk.overview_rows)
+        yield _TABLE_FOOT
+        yield _FLOW_HEAD
+        if svg is None:
+            yield '            <pre class="mermaid">\n'
+            # mermaid.js reads the decoded text, so escaped arrows still parse as edges
+            yield _h(flow)
+            yield '\n            </pre>'
+        else:
+            yield svg
+        yield _SECTIONS_HEAD
+        # Sections are the bulk of the page, so they are rendered and written one model at a time
+        for i, model in enumerate(models):
+            yield self._generate_model_section(i, model)
+        yield _HTML_TAIL_OPEN
+        if svg is None:
+            yield _MERMAID_INIT
+        yield _HTML_TAIL
+
+    def _generate_model_section(self, i: int, model: Dict[str, Any]) -> str:
+        """Generate the HTML section for one model."""
+        layer = model.get('layer', '')
+        h_layer = _h(layer)
+        badge_class = f'layer-{h_layer}' if layer else ''
+        sources = model.get('sources', [])
+        cols = model.get('column_mapping') or ()
+        aggs = model.get('aggregations') or ()
+        joins = model.get('joins') or ()
+
+        return f"""
+        <div class="model-section" id="model-{i}">
+            <h3>{_h(model.get('name', 'Unknown'))} <span class="layer-badge {badge_class}">{h_layer}</span></h3>
+
+            <p><strong>Sources:</strong> {', '.join(f'<code>{_h(s)}</code>' for s in sources)}</p>
+
+            {self._generate_columns_table(cols) if cols else ''}
+            {self._generate_aggregations_table(aggs) if aggs else ''}
+            {self._generate_joins_table(joins) if joins else ''}
+        </div>
+            """
+
+    def _generate_mermaid_flow(self, walk: _SpecWalk) -> str:
+        """Generate Mermaid data flow diagram from the collected nodes and edges."""
+        buf = io.StringIO()
+        write = buf.write
+        write("graph TD\n")
+        # Raw sources sorted by name, then model nodes in spec order
+        raw_nodes = walk.raw_nodes
+        for source in sorted(raw_nodes):
+            write(raw_nodes[source])
+        for line in walk.mermaid_nodes.values():
+            write(line)
+        write("\n")
+        write(walk.mermaid_edges.getvalue())
+        write("\n")
+        write(_FLOW_CLASS_DEFS)
+        return buf.getvalue()
+
+    def _generate_columns_table(self, cols: Sequence[Dict[str, Any]]) -> str:
+        """Generate columns table for a model."""
+        rows = [''] * len(cols)
+        for i, col in enumerate(cols):
+            transform = col.get('transform', '') or ''
+            transform_display = f'<code>{_h(transform[:100])}...</code>' if len(transform) > 100 else f'<code>{_h(transform)}</code>' if transform else ''
+
+            rows[i] = f"""
+            <tr>
+                <td><strong>{_h(col.get('target_column', ''))}</strong></td>
+                <td>{_h(col.get('type', ''))}</td>
+                <td><code>{_h(col.get('from_table', ''))}.{_h(col.get('from_column', ''))}</code></td>
+                <td>{transform_display}</td>
+                <td>{_h(col.get('description', '') or '')}</td>
+            </tr>
+            """
+
+        return _COLUMNS_TABLE_HEAD + ''.join(rows) + _TABLE_FOOT
+
+    def _generate_aggregations_table(self, aggs: Sequence[Dict[str, Any]]) -> str:
+        """Generate aggregations table for a model."""
+        rows = [''] * len(aggs)
+        for i, agg in enumerate(aggs):
+            rows[i] = f"""
+            <tr>
+                <td><strong>{_h(agg.get('metric_column', ''))}</strong></td>
+                <td>{_h(agg.get('type', ''))}</td>
+                <td><code>{_h(agg.get('formula', ''))}</code></td>
+                <td>{_h(agg.get('description', '') or '')}</td>
+            </tr>
+            """
+
+        return _AGGREGATIONS_TABLE_HEAD + ''.join(rows) + _TABLE_FOOT
+
+    def _generate_joins_table(self, joins: Sequence[Dict[str, Any]]) -> str:
+        """Generate joins table for a model."""
+        rows = [''] * len(joins)
+        for i, join in enumerate(joins):
+            rows[i] = f"""
+            <tr>
+                <td><code>{_h(join.get('left_table', ''))}</code></td>
+                <td><code>{_h(join.get('right_table', ''))}</code></td>
+                <td>{_h(join.get('type', ''))}</td>
+                <td><code>{_h(join.get('condition', ''))}</code></td>
+            </tr>
+            """
+
+        return _JOINS_TABLE_HEAD + ''.join(rows) + _TABLE_FOOT
+
+
 def main():
     """CLI entry point."""
     if len(sys.argv) < 2:
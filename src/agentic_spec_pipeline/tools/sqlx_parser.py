@@ -3,6 +3,14 @@ from typing import Dict, List
 
 REF_PATTERN = re.compile(r"\$\{\s*ref\(\s*'([^']+)'\s*\)\s*\}")
 CTE_NAME_PATTERN = re.compile(r"(?mi)^(\s*)([a-zA-Z_][a-zA-Z0-9_]*)\s+AS\s*\(")
+WITH_PATTERN = re.compile(r"(?mi)\bWITH\b")
+
+# REF_PATTERN and CTE_NAME_PATTERN as one alternation, so the text is scanned once
+_SCAN_PATTERN = re.compile(
+    r"\$\{\s*ref\(\s*'(?P<ref>[^']+)'\s*\)\s*\}"
+    r"|(?i:^\s*(?P<cte>[a-zA-Z_][a-zA-Z0-9_]*)\s+AS\s*\()",
+    re.MULTILINE,
+)
 
 
 def extract_ctes_and_refs(sqlx_text: str) -> Dict[str, List[str]]:
@@ -10,17 +18,19 @@ def extract_ctes_and_refs(sqlx_text: str) -> Dict[str, List[str]]:
     Extract CTE names and ${ref('table')} references from a SQLX file's text.
     This is a pragmatic parser that handles common patterns.
     """
-    refs = REF_PATTERN.findall(sqlx_text)
-
+    refs: List[str] = []
     ctes: List[str] = []
 
-    # Find the WITH block (if any), then capture CTE names in that block
-    with_idx = re.search(r"(?mi)\bWITH\b", sqlx_text)
-    if with_idx:
-        # Take substring starting at WITH to end; find occurrences of `<name> AS (` at line starts
-        with_sub = sqlx_text[with_idx.start() :]
-        for match in CTE_NAME_PATTERN.finditer(with_sub):
-            cte_name = match.group(2)
-            ctes.append(cte_name)
+    # CTE names only count from the WITH block (if any) onwards
+    with_idx = WITH_PATTERN.search(sqlx_text)
+    with_start = with_idx.start() if with_idx else -1
+
+    for match in _SCAN_PATTERN.finditer(sqlx_text):
+        ref = match.group('ref')
+        if ref is not None:
+            refs.append(ref)
+        elif with_idx and match.start() >= with_start:
+            ctes.append(match.group('cte'))
 
-    return {"ctes": ctes, "refs": sorted(set(refs))}
+    # Deduplicated in first-seen order, so refs follow the order they appear in the SQLX
+    return {"ctes": ctes, "refs": list(dict.fromkeys(refs))}
@@ -1,21 +1,31 @@
+import csv
+import io
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Dict, List
 
+from .._io import write_utf8
+
+# Above this many test files, writes are fanned out to a thread pool
+_PARALLEL_WRITE_THRESHOLD = 8
+
 TEST_HEADER = """-- Auto-generated test for {cte}
 -- Source file: {source}
 -- NOTE: Replace inline temp tables with richer mock datasets as needed.
 """
 
+# Escapes for a single-quoted BigQuery string literal; quoted CSV fields may carry quotes or newlines
+_BQ_STRING_ESCAPE = str.maketrans({"\\": "\\\\", "'": "\\'", "\n": "\\n", "\r": "\\r"})
+
 
 def _write_mock_temp_table_sql(table_name: str, csv_body: str) -> str:
-    lines = csv_body.strip().splitlines()
-    headers = lines[0].split(",")
-    values = lines[1:]
-    rows_sql = []
-    for v in values:
-        cols = v.split(",")
-        quoted = [f"'{c}'" for c in cols]
-        rows_sql.append(f"SELECT {', '.join(quoted)}")
+    # csv.reader honours quoted fields with embedded commas; values become BigQuery string literals
+    reader = csv.reader(io.StringIO(csv_body.strip()))
+    headers = next(reader)
+    rows_sql = [
+        "SELECT " + ", ".join("'" + c.translate(_BQ_STRING_ESCAPE) + "'" for c in row)
+        for row in reader
+    ]
     union_all = "\nUNION ALL\n".join(rows_sql) if rows_sql else "SELECT NULL AS placeholder"
     select_alias = ", ".join([f"{h}" for h in headers])
     return (
@@ -39,18 +49,26 @@ def generate_bq_tests(
     """Generate per-CTE BigQuery test scripts using inline temp tables for mocks."""
     written: List[str] = []
 
-    for cte in ctes or ["final_output"]:
-        parts = [TEST_HEADER.format(cte=cte, source=file_path)]
+    # Mock temp tables and the assertion are the same for every CTE, so build them once
+    body = "\n".join([
         # Inline mock temp tables
-        for table_name, csv_body in fixtures.items():
-            parts.append(_write_mock_temp_table_sql(table_name, csv_body))
+        *(_write_mock_temp_table_sql(table_name, csv_body) for table_name, csv_body in fixtures.items()),
         # Minimal assertion placeholder
-        parts.append(
-            "SELECT 1 AS test_assertion -- TODO: replace with real assertions against CTE output\n"
-        )
-        sql_text = "\n".join(parts)
+        "SELECT 1 AS test_assertion -- TODO: replace with real assertions against CTE output\n",
+    ])
+
+    outputs: Dict[Path, str] = {}
+    for cte in ctes or ["final_output"]:
         out_path = output_dir / f"test_{file_path.stem}_{cte}.sql"
-        out_path.write_text(sql_text)
+        outputs[out_path] = TEST_HEADER.format(cte=cte, source=file_path) + "\n" + body
         written.append(str(out_path))
 
+    # Rendering above is cheap string work; with many CTEs only the file writes are fanned out
+    if len(outputs) > _PARALLEL_WRITE_THRESHOLD:
+        with ThreadPoolExecutor(max_workers=min(32, len(outputs))) as ex:
+            list(ex.map(lambda item: write_utf8(*item), outputs.items()))
+    else:
+        for out_path, sql_text in outputs.items():
+            write_utf8(out_path, sql_text)
+
     return written
@@ -3,24 +3,37 @@ from __future__ import annotations
 import json
 import os
 from pathlib import Path
-from typing import Optional
+from typing import Any, BinaryIO, Optional
 
 from fastapi import FastAPI, UploadFile, Form
-from fastapi.responses import JSONResponse
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import JSONResponse, ORJSONResponse
 
+from ._io import orjson
 from .requirements.parser import parse_requirements_markdown
 from .requirements.spec_writer import write_spec_artifacts
-from .requirements.llm_preprocessor import llm_preprocess_requirements
 from .requirements.sqlx_generator import generate_sqlx_from_requirements
-from .requirements.llm_sqlx_generator import generate_sqlx_with_llm
 from .requirements.test_generator import generate_tests_from_requirements
-from .requirements.llm_test_generator import generate_tests_with_llm
+from .tools._spec_stream import STREAM_THRESHOLD_BYTES, ijson
 
 app = FastAPI(title="ADK Dataform Agent Web")
 
+# Responses are serialized with orjson when it is installed
+_JSONResponse = ORJSONResponse if orjson is not None else JSONResponse
+
 DEFAULT_MODEL = os.getenv("ADK_DEFAULT_MODEL", "gemini-2.0-flash")
 
 
+def _load_spec_upload(fileobj: BinaryIO, size: Optional[int]) -> Any:
+    """Parse an uploaded spec.json straight from its spooled file; run off the event loop."""
+    fileobj.seek(0)
+    if ijson is not None and size is not None and size > STREAM_THRESHOLD_BYTES:
+        return next(ijson.items(fileobj, "", use_float=True))
+    # Both loaders take bytes directly, so no decoded str copy is held alongside them
+    data = fileobj.read()
+    return orjson.loads(data) if orjson else json.loads(data)
+
+
 @app.post("/spec-from-req")
 async def spec_from_req(
     file: UploadFile,
@@ -30,12 +43,13 @@ async def spec_from_req(
 ):
     md_text = (await file.read()).decode("utf-8")
     if use_llm:
+        from .requirements.llm_preprocessor import llm_preprocess_requirements
         data = llm_preprocess_requirements(md_text, model_name=model)
     else:
         data = parse_requirements_markdown(md_text)
     definitions_dir = Path(out_root) / "definitions"
     artifacts = write_spec_artifacts(data, definitions_dir)
-    return JSONResponse({
+    return _JSONResponse({
         "spec_json": str(artifacts["spec_json"]),
         "mapping_docs": [str(p) for p in artifacts["mapping_docs"]],
     })
@@ -48,14 +62,15 @@ async def sqlx_from_spec(
     use_llm: bool = Form(False),
     model: str = Form(DEFAULT_MODEL),
 ):
-    data = json.loads((await spec_json.read()).decode("utf-8"))
+    data = await run_in_threadpool(_load_spec_upload, spec_json.file, spec_json.size)
     out_path = Path(out_dir)
     if use_llm:
+        from .requirements.llm_sqlx_generator import generate_sqlx_with_llm
         written = generate_sqlx_with_llm(data, out_path, model)
     else:
         last = generate_sqlx_from_requirements(data, out_path)
         written = [str(last)]
-    return JSONResponse({"written": written})
+    return _JSONResponse({"written": written})
 
 
 @app.post("/tests-from-spec")
@@ -66,13 +81,14 @@ async def tests_from_spec(
     use_llm: bool = Form(False),
     model: str = Form(DEFAULT_MODEL),
 ):
-    data = json.loads((await spec_json.read()).decode("utf-8"))
+    data = await run_in_threadpool(_load_spec_upload, spec_json.file, spec_json.size)
     out_path = Path(out_dir)
     if use_llm:
+        from .requirements.llm_test_generator import generate_tests_with_llm
         written = generate_tests_with_llm(data, out_path, model)
     else:
         source_text = None
         if req_source is not None:
             source_text = (await req_source.read()).decode("utf-8")
         written = generate_tests_from_requirements(data, out_path, source=source_text or "uploaded")
-    return JSONResponse({"written": written})
+    return _JSONResponse({"written": written})